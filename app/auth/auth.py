@@ -1,8 +1,11 @@
+import logging
 import os
-import requests
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
@@ -10,11 +13,20 @@ from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.http import TELEGRAM_SESSION
 from app.auth.models import User
 from app.auth.auth_schemas import TokenData
 
+logger = logging.getLogger(__name__)
+
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "10"))
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    bcrypt__ident="2b",
+)
 
 # JWT settings
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
@@ -24,6 +36,12 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 # Security scheme
 security = HTTPBearer()
 
+# Verified token cache: raw token -> (user_id, exp timestamp).
+# Only successfully decoded tokens are stored, and entries never outlive the token itself.
+TOKEN_CACHE_TTL_SECONDS = 5
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=TOKEN_CACHE_TTL_SECONDS)
+_token_cache_lock = threading.Lock()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
@@ -56,8 +74,18 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    token = credentials.credentials
+
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+
+    if cached is not None and cached[1] > time.time():
+        user = db.get(User, cached[0])
+        if user is None:
+            raise credentials_exception
+        return user
+
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
@@ -66,15 +94,21 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    user = db.get(User, token_data.user_id)
     if user is None:
         raise credentials_exception
 
+    exp_ts = payload.get("exp")
+    if exp_ts is not None and exp_ts > time.time():
+        with _token_cache_lock:
+            _token_cache[token] = (user.id, exp_ts)
+
     return user
 
 
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+TELEGRAM_TIMEOUT_SECONDS = 2
 
 
 def send_telegram_login_notification(user_email: str, name: str):
@@ -90,8 +124,8 @@ def send_telegram_login_notification(user_email: str, name: str):
     payload = {"chat_id": TELEGRAM_CHAT_ID, "text": message, "parse_mode": "Markdown"}
 
     try:
-        response = requests.post(url, json=payload)
+        response = TELEGRAM_SESSION.post(url, json=payload, timeout=TELEGRAM_TIMEOUT_SECONDS)
         response.raise_for_status()
-    except Exception as e:
+    except Exception:
         # Log the error but don't stop the user from logging in
-        print(f"Failed to send Telegram notification: {e}")
+        logger.exception("Failed to send Telegram notification")
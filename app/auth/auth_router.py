@@ -1,5 +1,5 @@
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.auth.auth import (
@@ -32,7 +32,11 @@ auth_router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
 @auth_router.post("/register", response_model=UserResponse)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+def register(
+    user_data: UserCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     """Register a new user and send verification email."""
     # Check if email already exists
     existing_user = db.query(User).filter(User.email == user_data.email).first()
@@ -57,14 +61,18 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(user)
 
-    # Send verification email (non-blocking, don't fail registration if email fails)
-    send_verification_email(user.email, user.name, verification_token)
+    # Send verification email after the response (don't fail registration if email fails)
+    background_tasks.add_task(send_verification_email, user.email, user.name, verification_token)
 
     return user
 
 
 @auth_router.post("/login", response_model=Token)
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
+def login(
+    user_data: UserLogin,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     """Authenticate user and return JWT token."""
     user = db.query(User).filter(User.email == user_data.email).first()
 
@@ -82,7 +90,8 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
         )
 
     access_token = create_access_token(data={"sub": user.id})
-    send_telegram_login_notification(user.email, name=user.name)
+    # Notify after the response is sent so the login does not wait on Telegram
+    background_tasks.add_task(send_telegram_login_notification, user.email, user.name)
     return Token(access_token=access_token)
 
 
@@ -126,7 +135,11 @@ def verify_email(data: EmailVerification, db: Session = Depends(get_db)):
 
 
 @auth_router.post("/resend-verification", response_model=MessageResponse)
-def resend_verification(data: ResendVerification, db: Session = Depends(get_db)):
+def resend_verification(
+    data: ResendVerification,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     """Resend verification email."""
     user = db.query(User).filter(User.email == data.email).first()
 
@@ -147,8 +160,8 @@ def resend_verification(data: ResendVerification, db: Session = Depends(get_db))
     user.verification_token_expires = get_verification_token_expiry()
     db.commit()
 
-    # Send email
-    send_verification_email(user.email, user.name, verification_token)
+    # Send email after the response
+    background_tasks.add_task(send_verification_email, user.email, user.name, verification_token)
 
     return MessageResponse(
         message="If the email exists, a verification link has been sent"
@@ -1,13 +1,48 @@
 """Email service using Resend API for sending verification emails."""
 
+import logging
 import os
 import secrets
 from datetime import datetime, timedelta
+from typing import Dict, List, Mapping, Optional, Tuple, Union
 
+import requests
 import resend
+from resend.http_client import HTTPClient
+
+from app.auth.email_templates import RESET_PASSWORD_TEMPLATE, VERIFY_EMAIL_TEMPLATE
+from app.core.http import RESEND_SESSION
+
+logger = logging.getLogger(__name__)
+
+
+class PooledResendClient(HTTPClient):
+    """Resend HTTP client that reuses keep-alive connections from a shared session."""
+
+    def __init__(self, session: requests.Session, timeout: int = 10):
+        self._session = session
+        self._timeout = timeout
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        json: Optional[Union[Dict[str, object], List[object]]] = None,
+    ) -> Tuple[bytes, int, Mapping[str, str]]:
+        try:
+            resp = self._session.request(
+                method=method, url=url, headers=headers, json=json, timeout=self._timeout
+            )
+            return resp.content, resp.status_code, resp.headers
+        except requests.RequestException as e:
+            # Resend wraps this into a ResendError, same as its default client
+            raise RuntimeError(f"Request failed: {e}") from e
+
 
 # Initialize Resend with API key
 resend.api_key = os.getenv("RESEND_API_KEY", "")
+resend.default_http_client = PooledResendClient(RESEND_SESSION)
 
 # Configuration
 VERIFICATION_TOKEN_EXPIRE_HOURS = 24
@@ -39,33 +74,9 @@ def send_verification_email(email: str, name: str, token: str) -> bool:
     """
     verification_url = f"{FRONTEND_URL}/verify-email?token={token}"
 
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    </head>
-    <body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
-        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; border-radius: 10px 10px 0 0; text-align: center;">
-            <h1 style="color: white; margin: 0; font-size: 28px;">DocuQuery</h1>
-        </div>
-        <div style="background: #ffffff; padding: 30px; border: 1px solid #e0e0e0; border-top: none; border-radius: 0 0 10px 10px;">
-            <h2 style="color: #333; margin-top: 0;">Welcome, {name}! 👋</h2>
-            <p>Thank you for signing up for DocuQuery. To complete your registration, please verify your email address by clicking the button below:</p>
-            <div style="text-align: center; margin: 30px 0;">
-                <a href="{verification_url}" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 14px 30px; text-decoration: none; border-radius: 8px; font-weight: 600; display: inline-block;">
-                    Verify Email Address
-                </a>
-            </div>
-            <p style="color: #666; font-size: 14px;">Or copy and paste this link into your browser:</p>
-            <p style="background: #f5f5f5; padding: 10px; border-radius: 5px; word-break: break-all; font-size: 12px; color: #666;">{verification_url}</p>
-            <p style="color: #999; font-size: 12px; margin-top: 30px;">This link will expire in {VERIFICATION_TOKEN_EXPIRE_HOURS} hours. If you didn't create an account, you can safely ignore this email.</p>
-        </div>
-        <p style="text-align: center; color: #999; font-size: 12px; margin-top: 20px;">© 2024 DocuQuery. All rights reserved.</p>
-    </body>
-    </html>
-    """
+    html_content = VERIFY_EMAIL_TEMPLATE.render(
+        name=name, url=verification_url, hours=VERIFICATION_TOKEN_EXPIRE_HOURS
+    )
 
     try:
         params = {
@@ -76,8 +87,8 @@ def send_verification_email(email: str, name: str, token: str) -> bool:
         }
         resend.Emails.send(params)
         return True
-    except Exception as e:
-        print(f"[ERROR] Failed to send verification email: {e}")
+    except Exception:
+        logger.exception("Failed to send verification email")
         return False
 
 
@@ -95,33 +106,7 @@ def send_password_reset_email(email: str, name: str, token: str) -> bool:
     """
     reset_url = f"{FRONTEND_URL}/reset-password?token={token}"
 
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    </head>
-    <body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
-        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; border-radius: 10px 10px 0 0; text-align: center;">
-            <h1 style="color: white; margin: 0; font-size: 28px;">DocuQuery</h1>
-        </div>
-        <div style="background: #ffffff; padding: 30px; border: 1px solid #e0e0e0; border-top: none; border-radius: 0 0 10px 10px;">
-            <h2 style="color: #333; margin-top: 0;">Password Reset Request</h2>
-            <p>Hi {name}, we received a request to reset your password. Click the button below to create a new password:</p>
-            <div style="text-align: center; margin: 30px 0;">
-                <a href="{reset_url}" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 14px 30px; text-decoration: none; border-radius: 8px; font-weight: 600; display: inline-block;">
-                    Reset Password
-                </a>
-            </div>
-            <p style="color: #666; font-size: 14px;">Or copy and paste this link into your browser:</p>
-            <p style="background: #f5f5f5; padding: 10px; border-radius: 5px; word-break: break-all; font-size: 12px; color: #666;">{reset_url}</p>
-            <p style="color: #999; font-size: 12px; margin-top: 30px;">This link will expire in 1 hour. If you didn't request a password reset, you can safely ignore this email.</p>
-        </div>
-        <p style="text-align: center; color: #999; font-size: 12px; margin-top: 20px;">© 2024 DocuQuery. All rights reserved.</p>
-    </body>
-    </html>
-    """
+    html_content = RESET_PASSWORD_TEMPLATE.render(name=name, url=reset_url)
 
     try:
         params = {
@@ -132,6 +117,6 @@ def send_password_reset_email(email: str, name: str, token: str) -> bool:
         }
         resend.Emails.send(params)
         return True
-    except Exception as e:
-        print(f"[ERROR] Failed to send password reset email: {e}")
+    except Exception:
+        logger.exception("Failed to send password reset email")
         return False
@@ -0,0 +1,69 @@
+"""Precompiled HTML templates for transactional emails."""
+
+from jinja2 import DictLoader, Environment
+
+_VERIFY_EMAIL_HTML = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    </head>
+    <body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
+        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; border-radius: 10px 10px 0 0; text-align: center;">
+            <h1 style="color: white; margin: 0; font-size: 28px;">DocuQuery</h1>
+        </div>
+        <div style="background: #ffffff; padding: 30px; border: 1px solid #e0e0e0; border-top: none; border-radius: 0 0 10px 10px;">
+            <h2 style="color: #333; margin-top: 0;">Welcome, {{ name }}! 👋</h2>
+            <p>Thank you for signing up for DocuQuery. To complete your registration, please verify your email address by clicking the button below:</p>
+            <div style="text-align: center; margin: 30px 0;">
+                <a href="{{ url }}" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 14px 30px; text-decoration: none; border-radius: 8px; font-weight: 600; display: inline-block;">
+                    Verify Email Address
+                </a>
+            </div>
+            <p style="color: #666; font-size: 14px;">Or copy and paste this link into your browser:</p>
+            <p style="background: #f5f5f5; padding: 10px; border-radius: 5px; word-break: break-all; font-size: 12px; color: #666;">{{ url }}</p>
+            <p style="color: #999; font-size: 12px; margin-top: 30px;">This link will expire in {{ hours }} hours. If you didn't create an account, you can safely ignore this email.</p>
+        </div>
+        <p style="text-align: center; color: #999; font-size: 12px; margin-top: 20px;">© 2024 DocuQuery. All rights reserved.</p>
+    </body>
+    </html>
+"""
+
+_RESET_PASSWORD_HTML = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    </head>
+    <body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
+        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; border-radius: 10px 10px 0 0; text-align: center;">
+            <h1 style="color: white; margin: 0; font-size: 28px;">DocuQuery</h1>
+        </div>
+        <div style="background: #ffffff; padding: 30px; border: 1px solid #e0e0e0; border-top: none; border-radius: 0 0 10px 10px;">
+            <h2 style="color: #333; margin-top: 0;">Password Reset Request</h2>
+            <p>Hi {{ name }}, we received a request to reset your password. Click the button below to create a new password:</p>
+            <div style="text-align: center; margin: 30px 0;">
+                <a href="{{ url }}" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 14px 30px; text-decoration: none; border-radius: 8px; font-weight: 600; display: inline-block;">
+                    Reset Password
+                </a>
+            </div>
+            <p style="color: #666; font-size: 14px;">Or copy and paste this link into your browser:</p>
+            <p style="background: #f5f5f5; padding: 10px; border-radius: 5px; word-break: break-all; font-size: 12px; color: #666;">{{ url }}</p>
+            <p style="color: #999; font-size: 12px; margin-top: 30px;">This link will expire in 1 hour. If you didn't request a password reset, you can safely ignore this email.</p>
+        </div>
+        <p style="text-align: center; color: #999; font-size: 12px; margin-top: 20px;">© 2024 DocuQuery. All rights reserved.</p>
+    </body>
+    </html>
+"""
+
+# Templates are compiled once at import; each send is only a render.
+_env = Environment(
+    loader=DictLoader({"verify_email": _VERIFY_EMAIL_HTML, "reset_password": _RESET_PASSWORD_HTML}),
+    autoescape=True,
+    auto_reload=False,
+)
+
+VERIFY_EMAIL_TEMPLATE = _env.get_template("verify_email")
+RESET_PASSWORD_TEMPLATE = _env.get_template("reset_password")
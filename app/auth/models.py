@@ -1,7 +1,7 @@
 import uuid
 import enum
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -29,6 +29,16 @@ class User(Base):
     # Relationship to folders
     folders = relationship("Folder", back_populates="user")
 
+    # Partial index: only unverified users carry a token worth looking up
+    __table_args__ = (
+        Index(
+            "ix_users_verification_token",
+            "verification_token",
+            postgresql_where=text("verification_token IS NOT NULL"),
+            sqlite_where=text("verification_token IS NOT NULL"),
+        ),
+    )
+
 
 class Folder(Base):
     """Folder model - represents one upload session with multiple files."""
@@ -56,6 +66,7 @@ class Document(Base):
     file_path = Column(String, nullable=False)
     status = Column(String, default=DocumentStatus.PROCESSING)
     task_id = Column(String, nullable=True)
+    content_hash = Column(String, nullable=True, index=True)  # SHA-256 of the uploaded file
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationship to Folder
@@ -16,17 +16,36 @@ class Settings:
 
     llm_model: str = os.getenv("LLM_MODEL", "claude-3-5-sonnet-20241022")
     llm_provider: str = os.getenv("LLM_PROVIDER", "openai")  # "anthropic" or "openai"
+    llm_max_tokens: int = int(os.getenv("LLM_MAX_TOKENS", "1024"))
+
+    enable_llm_batching: bool = os.getenv("ENABLE_LLM_BATCHING", "false").lower() == "true"
+    llm_batch_window_ms: int = int(os.getenv("LLM_BATCH_WINDOW_MS", "20"))
+    llm_max_batch: int = int(os.getenv("LLM_MAX_BATCH", "16"))
 
     embedding_model: str = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+    embedding_cache_path: str = os.getenv("EMBEDDING_CACHE_PATH", "./embedding_cache.db")
 
     top_k: int = int(os.getenv("TOP_K", "20"))
     rerank_top_k: int = int(os.getenv("RERANK_TOP_K", "5"))
+    rerank_concurrency: int = int(os.getenv("RERANK_CONCURRENCY", "8"))
+    rerank_skip_margin: float = float(os.getenv("RERANK_SKIP_MARGIN", "0.15"))
     hybrid_search_weight: float = float(os.getenv("HYBRID_SEARCH_WEIGHT", "0.5"))
 
     chunk_size: int = int(os.getenv("CHUNK_SIZE", "512"))
     chunk_overlap: int = int(os.getenv("CHUNK_OVERLAP", "80"))
 
+    ingest_workers: int = int(os.getenv("INGEST_WORKERS", "2"))
+    max_concurrent_ingest: int = int(os.getenv("MAX_CONCURRENT_INGEST", "4"))
+    max_concurrent_uploads: int = int(os.getenv("MAX_CONCURRENT_UPLOADS", "8"))
+
     max_conversation_history: int = int(os.getenv("MAX_CONVERSATION_HISTORY", "10"))
+    memory_backend: str = os.getenv("MEMORY_BACKEND", "memory")  # "memory" or "redis"
+    redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+    semantic_cache_enabled: bool = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+    semantic_cache_threshold: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+    semantic_cache_ttl_seconds: int = int(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "3600"))
+    semantic_cache_max_entries: int = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "1024"))
 
 
 settings = Settings()
@@ -1,35 +1,105 @@
-from typing import List, Tuple
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 from llama_index.core.schema import BaseNode
 from rank_bm25 import BM25Okapi
 
 
+def tokenize(text: str) -> List[str]:
+    """Tokenize text for BM25 indexing and querying."""
+    return text.lower().split()
+
+
+def tokenize_corpus(texts: List[str]) -> List[List[str]]:
+    """Tokenize a batch of texts for BM25 indexing."""
+    return list(map(tokenize, texts))
+
+
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Return indices of the top-k scores in descending order."""
+    k = min(top_k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+class IncrementalBM25Okapi(BM25Okapi):
+    """BM25Okapi that can add documents without re-reading the ones it already holds.
+
+    Per-term document counts and the total token count are kept, so an add only counts the
+    new documents and then recomputes IDF from the counts, once per distinct term.
+    """
+
+    def _initialize(self, corpus: List[List[str]]) -> Dict[str, int]:
+        self.nd: Dict[str, int] = {}
+        self.total_len = 0
+        self._count(corpus)
+        return self.nd
+
+    def _count(self, corpus: List[List[str]]) -> None:
+        """Record term frequencies and lengths of new documents and update corpus totals."""
+        for document in corpus:
+            frequencies = Counter(document)
+            self.doc_freqs.append(frequencies)
+            self.doc_len.append(len(document))
+            self.total_len += len(document)
+            for word in frequencies:
+                self.nd[word] = self.nd.get(word, 0) + 1
+
+        self.corpus_size = len(self.doc_len)
+        self.avgdl = self.total_len / self.corpus_size
+
+    def add_documents(self, corpus: List[List[str]]) -> None:
+        """Add tokenized documents to the index."""
+        self._count(corpus)
+        # Every term's IDF depends on corpus_size; _calc_idf overwrites each entry
+        self._calc_idf(self.nd)
+
+
 class BM25Retriever:
     """BM25 keyword-based retriever."""
 
     def __init__(self, nodes: List[BaseNode]):
         """Initialize BM25 index from nodes."""
-        self.nodes = nodes
-        self.node_texts = [node.get_content() for node in nodes]
-        tokenized_corpus = [text.lower().split() for text in self.node_texts]
-        self.bm25 = BM25Okapi(tokenized_corpus)
+        self.nodes = list(nodes)
+        self.node_texts = [node.get_content() for node in self.nodes]
+        self.bm25 = IncrementalBM25Okapi(tokenize_corpus(self.node_texts))
 
     def search(self, query: str, top_k: int = 20) -> List[Tuple[BaseNode, float]]:
         """Search for top-k nodes matching the query."""
-        tokenized_query = query.lower().split()
-        scores = self.bm25.get_scores(tokenized_query)
+        return self.search_tokens(tokenize(query), top_k=top_k)
 
-        scored_nodes = list(zip(self.nodes, scores))
-        scored_nodes.sort(key=lambda x: x[1], reverse=True)
+    def search_tokens(self, tokens: List[str], top_k: int = 20) -> List[Tuple[BaseNode, float]]:
+        """Search for top-k nodes matching an already tokenized query."""
+        idx, scores = self.search_indices(tokens, top_k=top_k)
+        return [(self.nodes[i], float(score)) for i, score in zip(idx, scores)]
 
-        return scored_nodes[:top_k]
+    def search_indices(
+        self, tokens: List[str], top_k: int = 20, mask: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Search with query tokens, returning top-k positions in self.nodes and their scores.
+
+        If mask is given, only nodes whose position is True in it are considered.
+        """
+        scores = self.bm25.get_scores(tokens)
+
+        if mask is not None:
+            candidates = np.flatnonzero(mask)
+            idx = candidates[top_k_indices(scores[candidates], top_k)]
+        else:
+            idx = top_k_indices(scores, top_k)
+        return idx, scores[idx]
 
     def add_nodes(self, nodes: List[BaseNode]) -> None:
         """Add new nodes to the BM25 index."""
+        if not nodes:
+            return
+
         new_texts = [node.get_content() for node in nodes]
 
         self.nodes.extend(nodes)
         self.node_texts.extend(new_texts)
-
-        all_tokenized = [text.lower().split() for text in self.node_texts]
-        self.bm25 = BM25Okapi(all_tokenized)
+        self.bm25.add_documents(tokenize_corpus(new_texts))
@@ -1,29 +1,46 @@
+import heapq
 import re
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from llama_index.core.schema import NodeWithScore
 
+_SENT_RE = re.compile(r"[.!?]+\s+")
 
-def _extract_key_sentences(text: str, query: str = None, max_length: int = 200) -> str:
+
+@lru_cache(maxsize=4096)
+def _split_sentences(node_id: Optional[str], text: str) -> Tuple[str, ...]:
+    """Split chunk text into sentences, memoized per node since chunks are immutable."""
+    return tuple(s.strip() for s in _SENT_RE.split(text) if s.strip())
+
+
+@lru_cache(maxsize=4096)
+def _sentence_token_sets(node_id: Optional[str], text: str) -> Tuple[FrozenSet[str], ...]:
+    """Lowercased token set for each sentence of a chunk, aligned with _split_sentences."""
+    return tuple(frozenset(s.lower().split()) for s in _split_sentences(node_id, text))
+
+
+def _extract_key_sentences(
+    text: str, query: str = None, max_length: int = 200, node_id: Optional[str] = None
+) -> str:
     """Extract key sentences from chunk text for citation display."""
     if len(text) <= max_length:
         return text
 
     # Split into sentences
-    sentences = re.split(r"[.!?]+\s+", text)
-    sentences = [s.strip() for s in sentences if s.strip()]
+    sentences = list(_split_sentences(node_id, text))
 
     if not sentences:
         return text[:max_length] + "..."
 
     # If query provided, prioritize sentences containing query keywords
     if query:
-        query_words = set(query.lower().split())
-        scored_sentences = []
-        for sent in sentences:
-            score = sum(1 for word in query_words if word in sent.lower())
-            scored_sentences.append((score, sent))
-        scored_sentences.sort(reverse=True, key=lambda x: x[0])
+        query_words = frozenset(query.lower().split())
+        token_sets = _sentence_token_sets(node_id, text)
+        scores = [len(query_words & tokens) for tokens in token_sets]
+        scored_sentences = heapq.nlargest(
+            len(sentences), zip(scores, sentences), key=lambda x: x[0]
+        )
         sentences = [s for _, s in scored_sentences]
 
     # Build summary from sentences
@@ -74,7 +91,7 @@ def extract_citations(
             "document": metadata.get("file_name", "unknown"),
             "document_id": metadata.get("document_id"),
             "page": page,
-            "chunk_text": _extract_key_sentences(chunk_text, query),
+            "chunk_text": _extract_key_sentences(chunk_text, query, node_id=node.node_id),
             "relevance_score": round(float(node_score.score), 4),
         }
 
@@ -0,0 +1,17 @@
+"""Shared HTTP sessions for outbound API calls."""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def create_pooled_session(pool_connections: int = 10, pool_maxsize: int = 20) -> requests.Session:
+    """Create a requests session that keeps connections alive across calls."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+TELEGRAM_SESSION = create_pooled_session()
+RESEND_SESSION = create_pooled_session()
@@ -1,13 +1,29 @@
-from typing import Dict, List, Tuple
+import threading
+from typing import Dict, List, Optional
 
+import numpy as np
 from llama_index.core import QueryBundle, VectorStoreIndex
 from llama_index.core.schema import BaseNode, NodeWithScore
+from llama_index.core.vector_stores import ExactMatchFilter, MetadataFilters
 
 from app.config import settings
-from app.core.bm25 import BM25Retriever
+from app.core.bm25 import BM25Retriever, tokenize, top_k_indices
 from app.ingest.index import index_manager
 
 
+def _normalize_scores(scores: np.ndarray) -> np.ndarray:
+    """Scale scores into [0, 1] by their maximum; all-zero if the maximum is not positive."""
+    max_score = scores.max() if scores.size else 0.0
+    if max_score <= 0:
+        return np.zeros(scores.shape, dtype=np.float32)
+    return np.divide(scores, max_score, dtype=np.float32)
+
+
+def _folder_ids(nodes: List[BaseNode]) -> np.ndarray:
+    """Folder id of each node as a string array, for vectorized folder filtering."""
+    return np.array([str(node.metadata.get("folder_id", "")) for node in nodes], dtype=str)
+
+
 class HybridRetriever:
     """Hybrid retriever combining vector and BM25 search."""
 
@@ -15,6 +31,11 @@ class HybridRetriever:
         self.vector_index: VectorStoreIndex = index_manager.get_index()
         self.bm25_retriever: BM25Retriever = None
         self.all_nodes: List[BaseNode] = []
+        self._node_id_to_row: Dict[str, int] = {}
+        self._row_folder_ids: np.ndarray = np.empty(0, dtype=str)
+        # Serializes add_nodes against the BM25 part of retrieve. Rows are append-only, so
+        # rows below a snapshot of len(all_nodes) stay valid after the lock is released.
+        self._lock = threading.Lock()
         self._load_nodes_from_index()
 
     def _load_nodes_from_index(self) -> None:
@@ -24,69 +45,114 @@ class HybridRetriever:
             if hasattr(docstore, "docs"):
                 nodes = [node for node in docstore.docs.values() if isinstance(node, BaseNode)]
                 self.all_nodes = nodes
+                self._node_id_to_row = {node.node_id: row for row, node in enumerate(nodes)}
+                self._row_folder_ids = _folder_ids(nodes)
                 if self.all_nodes:
                     self.bm25_retriever = BM25Retriever(self.all_nodes)
         except Exception:
             self.all_nodes = []
+            self._node_id_to_row = {}
+            self._row_folder_ids = np.empty(0, dtype=str)
             self.bm25_retriever = None
 
     def add_nodes(self, nodes: List[BaseNode]) -> None:
         """Add nodes and update both indices."""
-        self.all_nodes.extend(nodes)
-        if self.bm25_retriever is None:
-            self.bm25_retriever = BM25Retriever(self.all_nodes)
-        else:
-            self.bm25_retriever.add_nodes(nodes)
-
-    def retrieve(self, query: str, top_k: int = None) -> List[NodeWithScore]:
-        """Retrieve nodes using hybrid search."""
+        with self._lock:
+            offset = len(self.all_nodes)
+            self.all_nodes.extend(nodes)
+            for row, node in enumerate(nodes, start=offset):
+                self._node_id_to_row[node.node_id] = row
+            self._row_folder_ids = np.concatenate([self._row_folder_ids, _folder_ids(nodes)])
+            if self.bm25_retriever is None:
+                self.bm25_retriever = BM25Retriever(self.all_nodes)
+            else:
+                self.bm25_retriever.add_nodes(nodes)
+
+    def retrieve(
+        self,
+        query: str,
+        top_k: int = None,
+        query_embedding: Optional[List[float]] = None,
+        folder_id: Optional[str] = None,
+    ) -> List[NodeWithScore]:
+        """Retrieve nodes using hybrid search, optionally restricted to one folder.
+
+        The folder filter is applied inside both searches rather than on their results,
+        and query_embedding is reused for vector search if already computed.
+        """
         if top_k is None:
             top_k = settings.top_k
 
-        self._load_nodes_from_index()
-
-        results: Dict[str, Tuple[BaseNode, float]] = {}
-
         vector_weight = settings.hybrid_search_weight
         bm25_weight = 1.0 - vector_weight
 
-        if self.bm25_retriever:
-            bm25_results = self.bm25_retriever.search(query, top_k=top_k * 2)
-            max_bm25_score = max([score for _, score in bm25_results], default=1.0)
-
-            for node, score in bm25_results:
-                node_id = node.node_id if hasattr(node, "node_id") else str(id(node))
-                normalized_score = score / max_bm25_score if max_bm25_score > 0 else 0.0
-                if node_id not in results:
-                    results[node_id] = (node, 0.0)
-                _, current_score = results[node_id]
-                results[node_id] = (
-                    node,
-                    current_score + bm25_weight * normalized_score,
+        query_tokens = tokenize(query)
+
+        # Scores live in one array indexed by row in self.all_nodes. Vector hits that are
+        # not in all_nodes (e.g. loaded from Chroma only) get overflow rows after it.
+        extra_nodes: List[BaseNode] = []
+        extra_rows: Dict[str, int] = {}
+
+        rows_bm25 = np.empty(0, dtype=np.intp)
+        normalized_bm25 = np.empty(0, dtype=np.float32)
+        with self._lock:
+            # Nodes added after this snapshot are treated as overflow rows below
+            num_rows = len(self.all_nodes)
+            if self.bm25_retriever:
+                mask = self._row_folder_ids == str(folder_id) if folder_id else None
+                rows_bm25, bm25_scores = self.bm25_retriever.search_indices(
+                    query_tokens, top_k=top_k * 2, mask=mask
                 )
+                normalized_bm25 = _normalize_scores(bm25_scores)
 
+        rows_vec: List[int] = []
+        normalized_vec = np.empty(0, dtype=np.float32)
         try:
-            query_bundle = QueryBundle(query_str=query)
+            query_bundle = QueryBundle(query_str=query, embedding=query_embedding)
             # Use as_retriever() to properly query the vector store
-            retriever = self.vector_index.as_retriever(similarity_top_k=top_k * 2)
-            vector_results = retriever.retrieve(query_bundle)
-            max_vector_score = max([r.score for r in vector_results], default=1.0)
-
-            for result in vector_results[: top_k * 2]:
-                node_id = (
-                    result.node.node_id if hasattr(result.node, "node_id") else str(id(result.node))
-                )
-                normalized_score = result.score / max_vector_score if max_vector_score > 0 else 0.0
-                if node_id not in results:
-                    results[node_id] = (result.node, 0.0)
-                _, current_score = results[node_id]
-                results[node_id] = (
-                    result.node,
-                    current_score + vector_weight * normalized_score,
+            filters = None
+            if folder_id:
+                filters = MetadataFilters(
+                    filters=[ExactMatchFilter(key="folder_id", value=str(folder_id))]
                 )
+            retriever = self.vector_index.as_retriever(
+                similarity_top_k=top_k * 2, filters=filters
+            )
+            vector_results = retriever.retrieve(query_bundle)[: top_k * 2]
+
+            for result in vector_results:
+                node_id = result.node.node_id
+                row = self._node_id_to_row.get(node_id)
+                if row is None or row >= num_rows:
+                    row = extra_rows.get(node_id)
+                if row is None:
+                    row = num_rows + len(extra_nodes)
+                    extra_rows[node_id] = row
+                    extra_nodes.append(result.node)
+                rows_vec.append(row)
+
+            vector_scores = np.fromiter(
+                (r.score for r in vector_results), dtype=np.float32, count=len(vector_results)
+            )
+            normalized_vec = _normalize_scores(vector_scores)
         except Exception as e:
+            rows_vec = []
             print(f"[ERROR] Vector retrieval failed: {e}")
 
-        scored_nodes = sorted(results.values(), key=lambda x: x[1], reverse=True)
+        rows_vec = np.asarray(rows_vec, dtype=np.intp)
+
+        scores = np.zeros(num_rows + len(extra_nodes), dtype=np.float32)
+        np.add.at(scores, rows_bm25, bm25_weight * normalized_bm25)
+        np.add.at(scores, rows_vec, vector_weight * normalized_vec)
+
+        # Rank only rows that were actually returned by one of the retrievers
+        candidates = np.unique(np.concatenate([rows_bm25, rows_vec]))
+        best = candidates[top_k_indices(scores[candidates], top_k)]
 
-        return [NodeWithScore(node=node, score=score) for node, score in scored_nodes[:top_k]]
+        return [
+            NodeWithScore(
+                node=self.all_nodes[row] if row < num_rows else extra_nodes[row - num_rows],
+                score=float(scores[row]),
+            )
+            for row in best
+        ]
@@ -0,0 +1,29 @@
+"""Process pool for CPU-heavy document ingestion."""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.config import settings
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_ingest_pool() -> ProcessPoolExecutor:
+    """Get or create the ingestion process pool."""
+    global _pool
+    if _pool is None:
+        # Spawn rather than fork: the API process runs threads (logging, threadpool)
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.ingest_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_ingest_pool() -> None:
+    """Shut down the ingestion process pool if it was started."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -1,4 +1,5 @@
-from typing import List, Optional
+from functools import lru_cache
+from typing import AsyncIterator, List, Optional
 
 from llama_index.core.llms import LLM
 from llama_index.core.schema import NodeWithScore
@@ -8,14 +9,20 @@ from llama_index.llms.openai import OpenAI
 from app.config import settings
 
 
+@lru_cache(maxsize=None)
 def get_llm() -> LLM:
-    """Get LLM instance based on configuration."""
+    """Get LLM instance based on configuration.
+
+    The instance is cached so its HTTP connection pool is reused across requests;
+    call get_llm.cache_clear() after changing LLM settings.
+    """
     if settings.llm_provider == "anthropic":
         if not settings.anthropic_api_key:
             raise ValueError("ANTHROPIC_API_KEY not set in environment variables")
         return Anthropic(
             model=settings.llm_model,
             api_key=settings.anthropic_api_key,
+            max_tokens=settings.llm_max_tokens,
         )
     else:
         if not settings.openai_api_key:
@@ -28,9 +35,46 @@ def get_llm() -> LLM:
         return OpenAI(
             model=model,
             api_key=settings.openai_api_key,
+            max_tokens=settings.llm_max_tokens,
         )
 
 
+PROMPT_PREFIX = (
+    "You are a helpful assistant that answers questions based on the provided document context. \n"
+    "Use only the information from the sources below to answer the question. "
+    "If the answer cannot be found in the sources, say so.\n"
+    "\n"
+    "Sources:\n"
+)
+PROMPT_SUFFIX = "\n\nAnswer:"
+
+
+def _format_source(i: int, node: NodeWithScore) -> str:
+    """Format one retrieved node as a numbered source block."""
+    metadata = node.node.metadata
+    file_name = metadata.get("file_name", "unknown")
+    page = metadata.get("page_number")
+    page_info = f" (page {page})" if page else ""
+    return f"[Source {i} - {file_name}{page_info}]\n{node.node.get_content()}\n"
+
+
+def build_prompt(
+    query: str,
+    retrieved_nodes: List[NodeWithScore],
+    conversation_history: Optional[str] = None,
+) -> str:
+    """Build the answer prompt from retrieved context and conversation history."""
+    context = "\n".join([_format_source(i, node) for i, node in enumerate(retrieved_nodes, 1)])
+
+    history_text = (
+        f"\n\nPrevious conversation:\n{conversation_history}\n" if conversation_history else ""
+    )
+
+    return "".join(
+        (PROMPT_PREFIX, context, "\n\n", history_text, "\nQuestion: ", query, PROMPT_SUFFIX)
+    )
+
+
 def generate_answer(
     query: str,
     retrieved_nodes: List[NodeWithScore],
@@ -38,33 +82,39 @@ def generate_answer(
 ) -> str:
     """Generate answer from retrieved context."""
     llm = get_llm()
+    prompt = build_prompt(query, retrieved_nodes, conversation_history)
 
-    context_parts = []
-    for i, node in enumerate(retrieved_nodes, 1):
-        content = node.node.get_content()
-        metadata = node.node.metadata
-        file_name = metadata.get("file_name", "unknown")
-        page = metadata.get("page_number", "")
-        page_info = f" (page {page})" if page else ""
+    response = llm.complete(prompt)
+    return str(response).strip()
 
-        context_parts.append(f"[Source {i} - {file_name}{page_info}]\n{content}\n")
 
-    context = "\n".join(context_parts)
+async def agenerate_answer(
+    query: str,
+    retrieved_nodes: List[NodeWithScore],
+    conversation_history: Optional[str] = None,
+) -> str:
+    """Generate answer from retrieved context without blocking the event loop."""
+    prompt = build_prompt(query, retrieved_nodes, conversation_history)
 
-    history_text = ""
-    if conversation_history:
-        history_text = f"\n\nPrevious conversation:\n{conversation_history}\n"
+    if settings.enable_llm_batching:
+        from app.core.llm_batcher import batcher
 
-    prompt = f"""You are a helpful assistant that answers questions based on the provided document context. 
-Use only the information from the sources below to answer the question. If the answer cannot be found in the sources, say so.
+        return await batcher.submit(prompt)
 
-Sources:
-{context}
+    response = await get_llm().acomplete(prompt)
+    return str(response).strip()
 
-{history_text}
-Question: {query}
 
-Answer:"""
+async def stream_answer(
+    query: str,
+    retrieved_nodes: List[NodeWithScore],
+    conversation_history: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """Stream the answer from retrieved context as text deltas."""
+    llm = get_llm()
+    prompt = build_prompt(query, retrieved_nodes, conversation_history)
 
-    response = llm.complete(prompt)
-    return str(response).strip()
+    response_stream = await llm.astream_complete(prompt)
+    async for chunk in response_stream:
+        if chunk.delta:
+            yield chunk.delta
@@ -0,0 +1,84 @@
+"""Micro-batching of concurrent LLM completion requests."""
+
+import asyncio
+from typing import List, Optional, Set, Tuple
+
+from app.config import settings
+from app.core.llm import get_llm
+
+
+class LLMBatcher:
+    """Coalesce prompts arriving within a short window and dispatch them together.
+
+    Each batch is issued as concurrent `acomplete` calls on the shared LLM client, so
+    simultaneous queries overlap their provider round-trips on one connection pool.
+    """
+
+    def __init__(self, window_ms: int = 20, max_batch: int = 16):
+        self.window_seconds = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # The event loop only holds weak references to tasks; keep in-flight dispatches alive
+        self._pending: Set[asyncio.Task] = set()
+
+    def _ensure_worker(self) -> None:
+        """Start the batching loop on the running event loop if it is not running yet."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, prompt: str) -> str:
+        """Queue a prompt and wait for its completion text."""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((prompt, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Collect queued prompts into batches of up to max_batch within the window."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window_seconds
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Dispatch without waiting so the next batch can be collected meanwhile
+            task = loop.create_task(self._dispatch(batch))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Run a batch of prompts concurrently and resolve each caller's future."""
+        try:
+            llm = get_llm()
+            results = await asyncio.gather(
+                *[llm.acomplete(prompt) for prompt, _ in batch], return_exceptions=True
+            )
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(str(result).strip())
+
+
+batcher = LLMBatcher(
+    window_ms=settings.llm_batch_window_ms,
+    max_batch=settings.llm_max_batch,
+)
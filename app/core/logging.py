@@ -1,20 +1,38 @@
 """Logging configuration for DocuQuery backend."""
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 
 import structlog
 
+_queue_listener: logging.handlers.QueueListener = None
+
 
 def setup_logging(log_level: str = "INFO") -> None:
     """Configure structured logging for the application."""
+    global _queue_listener
 
-    # Configure standard logging
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, log_level.upper()),
-    )
+    # Configure standard logging: handlers only enqueue records, and a background
+    # listener thread does the formatting and stdout writes
+    if _queue_listener is None:
+        log_queue: queue.Queue = queue.Queue(-1)
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+        root_logger = logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+        _queue_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        _queue_listener.start()
+        atexit.register(_queue_listener.stop)
+
+    logging.getLogger().setLevel(getattr(logging, log_level.upper()))
 
     # Configure structlog
     structlog.configure(
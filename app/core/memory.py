@@ -1,5 +1,8 @@
+import threading
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional
+from itertools import islice
+from typing import Deque, Dict, List, Optional
 
 from app.config import settings
 
@@ -8,15 +11,13 @@ class ConversationMemory:
     """In-memory conversation history manager."""
 
     def __init__(self):
-        self.sessions: Dict[str, List[Dict]] = {}
+        self.sessions: Dict[str, Deque[Dict]] = {}
+        self._lock = threading.Lock()
 
     def add_message(
         self, session_id: str, role: str, content: str, metadata: Optional[Dict] = None
     ) -> None:
         """Add a message to the conversation history."""
-        if session_id not in self.sessions:
-            self.sessions[session_id] = []
-
         message = {
             "role": role,
             "content": content,
@@ -26,29 +27,31 @@ class ConversationMemory:
         if metadata:
             message["metadata"] = metadata
 
-        self.sessions[session_id].append(message)
+        with self._lock:
+            if session_id not in self.sessions:
+                self.sessions[session_id] = deque(maxlen=settings.max_conversation_history * 2)
 
-        if len(self.sessions[session_id]) > settings.max_conversation_history * 2:
-            self.sessions[session_id] = self.sessions[session_id][
-                -settings.max_conversation_history * 2 :
-            ]
+            # The deque's maxlen evicts the oldest message in O(1)
+            self.sessions[session_id].append(message)
 
     def get_history(self, session_id: str) -> List[Dict]:
         """Get conversation history for a session."""
-        return self.sessions.get(session_id, [])
+        with self._lock:
+            return list(self.sessions.get(session_id, ()))
 
     def get_recent_history(self, session_id: str, n: int = None) -> List[Dict]:
         """Get recent conversation history."""
         if n is None:
             n = settings.max_conversation_history
 
-        history = self.get_history(session_id)
-        return history[-n:] if len(history) > n else history
+        with self._lock:
+            history = self.sessions.get(session_id, ())
+            return list(islice(history, max(0, len(history) - n), None))
 
     def clear_session(self, session_id: str) -> None:
         """Clear conversation history for a session."""
-        if session_id in self.sessions:
-            del self.sessions[session_id]
+        with self._lock:
+            self.sessions.pop(session_id, None)
 
     def format_history_for_llm(self, session_id: str) -> str:
         """Format conversation history for LLM context."""
@@ -63,4 +66,13 @@ class ConversationMemory:
         return "\n".join(formatted)
 
 
-memory = ConversationMemory()
+def _create_memory():
+    """Create the conversation store selected by MEMORY_BACKEND."""
+    if settings.memory_backend == "redis":
+        from app.core.memory_redis import RedisConversationMemory
+
+        return RedisConversationMemory(settings.redis_url)
+    return ConversationMemory()
+
+
+memory = _create_memory()
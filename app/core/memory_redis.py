@@ -0,0 +1,72 @@
+import json
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import redis
+
+from app.config import settings
+
+# Idle sessions expire after a day
+SESSION_TTL_SECONDS = 24 * 60 * 60
+
+
+class RedisConversationMemory:
+    """Redis-backed conversation history shared across workers.
+
+    Each session is a capped list stored newest-first under ``sess:{session_id}``.
+    """
+
+    def __init__(self, redis_url: str):
+        self.client = redis.Redis.from_url(redis_url, decode_responses=True)
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"sess:{session_id}"
+
+    def add_message(
+        self, session_id: str, role: str, content: str, metadata: Optional[Dict] = None
+    ) -> None:
+        """Add a message to the conversation history."""
+        message = {
+            "role": role,
+            "content": content,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+        if metadata:
+            message["metadata"] = metadata
+
+        key = self._key(session_id)
+        # Push, trim and refresh the TTL atomically, so concurrent writers can't race
+        pipe = self.client.pipeline(transaction=True)
+        pipe.lpush(key, json.dumps(message))
+        pipe.ltrim(key, 0, settings.max_conversation_history * 2 - 1)
+        pipe.expire(key, SESSION_TTL_SECONDS)
+        pipe.execute()
+
+    def get_history(self, session_id: str) -> List[Dict]:
+        """Get conversation history for a session."""
+        return self._range(session_id, -1)
+
+    def get_recent_history(self, session_id: str, n: int = None) -> List[Dict]:
+        """Get recent conversation history."""
+        if n is None:
+            n = settings.max_conversation_history
+
+        if n <= 0:
+            return []
+        return self._range(session_id, n - 1)
+
+    def _range(self, session_id: str, end: int) -> List[Dict]:
+        """Read the newest messages up to index end, in chronological order."""
+        raw = self.client.lrange(self._key(session_id), 0, end)
+        return [json.loads(item) for item in reversed(raw)]
+
+    def clear_session(self, session_id: str) -> None:
+        """Clear conversation history for a session."""
+        self.client.delete(self._key(session_id))
+
+    def format_history_for_llm(self, session_id: str) -> str:
+        """Format conversation history for LLM context."""
+        history = self.get_recent_history(session_id)
+        return "\n".join(f"{msg['role'].capitalize()}: {msg['content']}" for msg in history)
@@ -0,0 +1,17 @@
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import Receive, Scope, Send
+
+
+class DocumentAwareGZipMiddleware(GZipMiddleware):
+    """GZip middleware that leaves raw document downloads untouched.
+
+    Raw files are served by FileResponse, which can use zero-copy sendfile and answer
+    Range requests only when its body is not rewritten by compression.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].endswith("/raw"):
+            await self.app(scope, receive, send)
+            return
+
+        await super().__call__(scope, receive, send)
@@ -1,23 +1,56 @@
+import asyncio
+import re
 from typing import List
 
 import cohere
+import httpx
+from cachetools import TTLCache
 from llama_index.core.schema import NodeWithScore
 
 from app.config import settings
 
+# Rerank results for the same query and candidate set are reused for this long
+RERANK_CACHE_TTL_SECONDS = 15 * 60
+
+_QUOTED_QUERY_RE = re.compile(r'^"[^"]+"$')
+
 
 class CohereReranker:
     """Cohere reranker for improving retrieval relevance."""
 
     def __init__(self):
         self.client = None
+        self._semaphore = asyncio.Semaphore(settings.rerank_concurrency)
+        self._cache: TTLCache = TTLCache(maxsize=1024, ttl=RERANK_CACHE_TTL_SECONDS)
         if settings.cohere_api_key:
             try:
-                self.client = cohere.Client(api_key=settings.cohere_api_key)
+                self.client = cohere.AsyncClient(
+                    api_key=settings.cohere_api_key,
+                    httpx_client=httpx.AsyncClient(
+                        limits=httpx.Limits(max_keepalive_connections=20)
+                    ),
+                )
             except Exception:
                 self.client = None
 
-    def rerank(
+    @staticmethod
+    def _can_skip(query: str, nodes: List[NodeWithScore], top_k: int) -> bool:
+        """Check whether retrieval order is already trustworthy enough to skip reranking.
+
+        Literal lookups (an exact quoted phrase or a file name among the candidates) are
+        already served well by keyword matching, and a wide score gap at the top-k boundary
+        means retrieval clearly separates the kept nodes from the rest.
+        """
+        query = query.strip()
+        if _QUOTED_QUERY_RE.match(query):
+            return True
+        if any(node.node.metadata.get("file_name") == query for node in nodes):
+            return True
+
+        gap = (nodes[top_k - 1].score or 0.0) - (nodes[top_k].score or 0.0)
+        return gap > settings.rerank_skip_margin
+
+    async def rerank(
         self, query: str, nodes: List[NodeWithScore], top_k: int = None
     ) -> List[NodeWithScore]:
         """Rerank nodes using Cohere API."""
@@ -30,29 +63,28 @@ class CohereReranker:
         if len(nodes) <= top_k:
             return nodes
 
-        if not self.client:
+        if not self.client or self._can_skip(query, nodes, top_k):
             return nodes[:top_k]
 
-        documents = [node.node.get_content() for node in nodes]
-
-        try:
-            response = self.client.rerank(
-                model="rerank-english-v3.0",
-                query=query,
-                documents=documents,
-                top_n=top_k,
-            )
-
-            reranked_nodes = []
-            for result in response.results:
-                idx = result.index
-                reranked_nodes.append(
-                    NodeWithScore(
-                        node=nodes[idx].node,
-                        score=result.relevance_score,
+        # Chunks are immutable, so node ids identify the candidate documents
+        cache_key = (query, top_k, tuple(node.node.node_id for node in nodes))
+        ranking = self._cache.get(cache_key)
+
+        if ranking is None:
+            documents = [node.node.get_content() for node in nodes]
+
+            try:
+                async with self._semaphore:
+                    response = await self.client.rerank(
+                        model="rerank-english-v3.0",
+                        query=query,
+                        documents=documents,
+                        top_n=top_k,
                     )
-                )
+            except Exception:
+                return nodes[:top_k]
 
-            return reranked_nodes
-        except Exception:
-            return nodes[:top_k]
+            ranking = [(result.index, result.relevance_score) for result in response.results]
+            self._cache[cache_key] = ranking
+
+        return [NodeWithScore(node=nodes[idx].node, score=score) for idx, score in ranking]
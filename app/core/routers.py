@@ -1,23 +1,44 @@
 import os
+import json
+import asyncio
+import hashlib
 import uuid
 import logging
 from datetime import datetime
-from typing import List
-
-from fastapi import APIRouter, BackgroundTasks, HTTPException, UploadFile, Depends, File, Form
-from fastapi.responses import FileResponse
+from typing import AsyncIterator, Dict, List, Optional
+
+import aiofiles
+import numpy as np
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+    Depends,
+    File,
+    Form,
+)
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, StreamingResponse
+from llama_index.core.schema import NodeWithScore
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.core.citations import extract_citations
 from app.core.database import get_db
-from app.core.llm import generate_answer
+from app.core.llm import agenerate_answer, stream_answer
 from app.core.memory import memory
 from app.core.schemas import QueryRequest, QueryResponse
+from app.core.semantic_cache import semantic_cache
 from app.core.task_store import create_task, get_task as get_task_from_db
 from app.core.tasks import (
+    acopy_or_index_document,
+    aprocess_and_index_document,
     get_hybrid_retriever,
+    get_query_embedding,
     get_reranker,
-    process_and_index_document,
 )
 from app.auth.auth import get_current_user
 from app.auth.models import User, Folder, Document, DocumentStatus
@@ -29,6 +50,13 @@ router = APIRouter(prefix="/api")
 # Daily upload limit per user (limit on folders/upload sessions, not files)
 DAILY_UPLOAD_LIMIT = 3
 
+# Uploads are streamed to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Process-wide caps on files being written to disk and documents being indexed
+_UPLOAD_SEMAPHORE = asyncio.Semaphore(settings.max_concurrent_uploads)
+_INGEST_SEMAPHORE = asyncio.Semaphore(settings.max_concurrent_ingest)
+
 
 def get_user_folders_today(db: Session, user_id: str) -> int:
     """Count how many folders (upload sessions) user created today."""
@@ -39,6 +67,20 @@ def get_user_folders_today(db: Session, user_id: str) -> int:
     return count
 
 
+def find_duplicate_document(db: Session, user_id: str, content_hash: str) -> Optional[Document]:
+    """Find an already indexed document of this user with the same content."""
+    return (
+        db.query(Document)
+        .join(Folder)
+        .filter(
+            Folder.user_id == user_id,
+            Document.content_hash == content_hash,
+            Document.status == DocumentStatus.COMPLETED,
+        )
+        .first()
+    )
+
+
 def get_next_folder_name(db: Session, user_id: str) -> str:
     """Generate next folder name like 'Upload 1', 'Upload 2', etc."""
     count = db.query(Folder).filter(Folder.user_id == user_id).count()
@@ -65,22 +107,23 @@ async def upload(
     if not files or len(files) == 0:
         raise HTTPException(status_code=400, detail="No files provided")
 
-    # Create folder for this upload session
+    # Create folder for this upload session. Ids are generated here so the folder and all
+    # of its documents can be committed together once the files are written.
     folder = Folder(
+        id=str(uuid.uuid4()),
         user_id=current_user.id,
         name=folder_name
         if folder_name and folder_name.strip()
         else get_next_folder_name(db, current_user.id),
     )
     db.add(folder)
-    db.commit()
-    db.refresh(folder)
 
     # Create user-specific upload directory
     user_upload_dir = f"uploads/{current_user.id}/{folder.id}"
     os.makedirs(user_upload_dir, exist_ok=True)
 
     uploaded_docs = []
+    pending_tasks = []
 
     for file in files:
         # Generate unique filename
@@ -90,33 +133,40 @@ async def upload(
         task_id = str(uuid.uuid4())
 
         try:
-            with open(save_path, "wb") as f:
-                content = await file.read()
-                f.write(content)
+            # Hash while writing so duplicates can reuse existing embeddings
+            hasher = hashlib.sha256()
+            async with _UPLOAD_SEMAPHORE, aiofiles.open(save_path, "wb") as f:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    await f.write(chunk)
+            content_hash = hasher.hexdigest()
+            duplicate = find_duplicate_document(db, current_user.id, content_hash)
 
             # Create task in task store
             create_task(task_id, file.filename)
 
             # Create document record
             document = Document(
+                id=str(uuid.uuid4()),
                 folder_id=folder.id,
                 filename=file.filename,
                 file_path=save_path,
                 status=DocumentStatus.PROCESSING,
                 task_id=task_id,
+                content_hash=content_hash,
             )
             db.add(document)
-            db.commit()
-            db.refresh(document)
-
-            # Start background indexing with folder_id and original filename
-            background_tasks.add_task(
-                process_and_index_document_with_status,
-                save_path,
-                task_id,
-                document.id,
-                folder.id,
-                file.filename,
+
+            pending_tasks.append(
+                (
+                    save_path,
+                    task_id,
+                    document.id,
+                    folder.id,
+                    file.filename,
+                    duplicate.id if duplicate else None,
+                    duplicate.task_id if duplicate else None,
+                )
             )
 
             uploaded_docs.append(
@@ -136,6 +186,12 @@ async def upload(
                 }
             )
 
+    db.commit()
+
+    # Start background indexing only once the documents are committed
+    for args in pending_tasks:
+        background_tasks.add_task(process_and_index_document_with_status, *args)
+
     return {
         "ok": True,
         "folder_id": folder.id,
@@ -145,45 +201,94 @@ async def upload(
     }
 
 
-def process_and_index_document_with_status(
-    file_path: str, task_id: str, document_id: str, folder_id: str, original_filename: str = None
-):
-    """Process document and update status in database."""
+def _update_document_status(task_id: str, document_id: str) -> None:
+    """Set the document status from its task status."""
     from app.core.database import SessionLocal
 
+    db = SessionLocal()
     try:
-        # This calls the existing indexing function with folder_id and original filename
-        process_and_index_document(file_path, task_id, folder_id, document_id, original_filename)
+        task = get_task_from_db(task_id)
+        if task and task.get("status") == "completed":
+            db.query(Document).filter(Document.id == document_id).update(
+                {"status": DocumentStatus.COMPLETED}
+            )
+        else:
+            db.query(Document).filter(Document.id == document_id).update(
+                {"status": DocumentStatus.FAILED}
+            )
+        db.commit()
+    finally:
+        db.close()
 
-        # Create new session for status update
-        db = SessionLocal()
+
+def _mark_document_failed(document_id: str) -> None:
+    """Set the document status to failed."""
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        db.query(Document).filter(Document.id == document_id).update(
+            {"status": DocumentStatus.FAILED}
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def process_and_index_document_with_status(
+    file_path: str,
+    task_id: str,
+    document_id: str,
+    folder_id: str,
+    original_filename: str = None,
+    source_document_id: str = None,
+    source_task_id: str = None,
+):
+    """Process document in the ingest pool and update status in database.
+
+    If source_document_id names an identical, already indexed upload, its chunks and
+    embeddings are copied instead. At most MAX_CONCURRENT_INGEST documents are indexed
+    at once; the rest wait here.
+    """
+    async with _INGEST_SEMAPHORE:
         try:
-            # Update document status based on task status
-            task = get_task_from_db(task_id)
-            if task and task.get("status") == "completed":
-                db.query(Document).filter(Document.id == document_id).update(
-                    {"status": DocumentStatus.COMPLETED}
+            if source_document_id:
+                await acopy_or_index_document(
+                    source_document_id,
+                    source_task_id,
+                    file_path,
+                    task_id,
+                    folder_id,
+                    document_id,
+                    original_filename,
                 )
             else:
-                db.query(Document).filter(Document.id == document_id).update(
-                    {"status": DocumentStatus.FAILED}
+                # Loading and chunking run in a separate process; see aprocess_and_index_document
+                await aprocess_and_index_document(
+                    file_path, task_id, folder_id, document_id, original_filename
                 )
-            db.commit()
-        finally:
-            db.close()
-    except Exception:
-        db = SessionLocal()
-        try:
-            db.query(Document).filter(Document.id == document_id).update(
-                {"status": DocumentStatus.FAILED}
-            )
-            db.commit()
-        finally:
-            db.close()
+            await asyncio.to_thread(_update_document_status, task_id, document_id)
+        except Exception:
+            await asyncio.to_thread(_mark_document_failed, document_id)
+
+
+def _etag_response(http_request: Request, payload: Dict) -> Response:
+    """Serialize payload as JSON with an ETag, or return 304 if the client's copy matches."""
+    body = json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode()
+    # Weak validator: the representation may be gzip-encoded on the way out
+    etag = f'W/"{hashlib.md5(body).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = http_request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/folders")
 async def get_folders(
+    http_request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -198,7 +303,7 @@ async def get_folders(
     # Get remaining uploads for today
     folders_today = get_user_folders_today(db, current_user.id)
 
-    return {
+    payload = {
         "folders": [
             {
                 "id": folder.id,
@@ -220,6 +325,7 @@ async def get_folders(
         "uploads_remaining": DAILY_UPLOAD_LIMIT - folders_today,
         "daily_limit": DAILY_UPLOAD_LIMIT,
     }
+    return _etag_response(http_request, payload)
 
 
 @router.get("/tasks/{task_id}")
@@ -293,49 +399,172 @@ async def get_document_raw(
     if not os.path.exists(document.file_path):
         raise HTTPException(status_code=404, detail="File not found on server")
 
-    # Return file response
-    return FileResponse(document.file_path, filename=document.filename)
+    # FileResponse answers Range requests itself (206 + Content-Range), so PDF viewers can
+    # fetch pages on demand. Upload paths are never reused, so the file can be cached.
+    return FileResponse(
+        document.file_path,
+        filename=document.filename,
+        headers={
+            "Accept-Ranges": "bytes",
+            "Cache-Control": "private, max-age=3600, immutable",
+        },
+    )
+
+
+def _sse_event(payload: Dict) -> str:
+    """Format a payload as a server-sent event."""
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+def _wants_event_stream(http_request: Request) -> bool:
+    """Check whether the client asked for a server-sent event stream."""
+    return "text/event-stream" in http_request.headers.get("accept", "")
+
+
+def _fixed_answer_response(
+    answer: str, sources: List[Dict], session_id: str, streaming: bool
+):
+    """Respond with an already known answer, as JSON or as an event stream."""
+    if not streaming:
+        return QueryResponse(answer=answer, sources=sources, session_id=session_id)
+
+    events = [
+        _sse_event({"delta": answer}),
+        _sse_event({"sources": sources, "session_id": session_id}),
+    ]
+    return StreamingResponse(iter(events), media_type="text/event-stream")
+
+
+def _persist_turn(
+    session_id: str,
+    query: str,
+    answer: str,
+    citations: List[Dict],
+    query_embedding: Optional[List[float]] = None,
+    folder_id: Optional[str] = None,
+) -> None:
+    """Record a query/answer turn in memory and, if embedded, in the semantic cache."""
+    memory.add_message(session_id, "user", query)
+    memory.add_message(session_id, "assistant", answer, {"sources": citations})
+
+    if query_embedding is not None:
+        semantic_cache.put(
+            query_embedding, folder_id, session_id, {"answer": answer, "sources": citations}
+        )
+
+
+async def _stream_query_answer(
+    query: str,
+    reranked_nodes: List[NodeWithScore],
+    conversation_history: str,
+    session_id: str,
+    query_embedding: Optional[List[float]] = None,
+    folder_id: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """Stream answer deltas, then a final event with sources once the answer is complete."""
+    parts = []
+    try:
+        async for delta in stream_answer(query, reranked_nodes, conversation_history):
+            parts.append(delta)
+            yield _sse_event({"delta": delta})
+    except Exception as e:
+        yield _sse_event({"error": str(e)})
+        return
+
+    answer = "".join(parts).strip()
+    citations = extract_citations(reranked_nodes, query)
+
+    yield _sse_event({"sources": citations, "session_id": session_id})
+
+    # Persist only after the client has the final event
+    await asyncio.to_thread(
+        _persist_turn, session_id, query, answer, citations, query_embedding, folder_id
+    )
 
 
 @router.post("/query", response_model=QueryResponse)
-async def query(request: QueryRequest):
-    """Query the document knowledge base."""
+async def query(
+    request: QueryRequest, http_request: Request, background_tasks: BackgroundTasks
+):
+    """Query the document knowledge base.
+
+    Clients sending `Accept: text/event-stream` receive the answer as server-sent events:
+    `{"delta": ...}` chunks followed by a final `{"sources": ..., "session_id": ...}` event.
+    """
     session_id = request.session_id or str(uuid.uuid4())
+    streaming = _wants_event_stream(http_request)
 
     try:
-        retrieved_nodes = get_hybrid_retriever().retrieve(request.query)
+        query_embedding = None
+        if settings.semantic_cache_enabled:
+            query_embedding = await get_query_embedding(request.query)
+
+        if query_embedding is not None:
+            cached = semantic_cache.lookup(
+                query_embedding,
+                request.folder_id,
+                session_id,
+                threshold=settings.semantic_cache_threshold,
+            )
+            if cached is not None:
+                background_tasks.add_task(
+                    _persist_turn, session_id, request.query, cached["answer"], cached["sources"]
+                )
+                return _fixed_answer_response(
+                    cached["answer"], cached["sources"], session_id, streaming
+                )
 
-        # Filter by folder_id if specified
-        if request.folder_id:
-            retrieved_nodes = [
-                node
-                for node in retrieved_nodes
-                if str(node.metadata.get("folder_id", "")) == str(request.folder_id)
-            ]
+        # Restrict to folder_id (if specified) inside the retrievers. BM25 scoring and the
+        # vector store query are blocking, so run them off the event loop.
+        retrieved_nodes = await asyncio.to_thread(
+            get_hybrid_retriever().retrieve,
+            request.query,
+            query_embedding=query_embedding,
+            folder_id=request.folder_id,
+        )
 
         if not retrieved_nodes:
-            return QueryResponse(
-                answer="I couldn't find any relevant information in the selected folder's documents.",
-                sources=[],
-                session_id=session_id,
+            return _fixed_answer_response(
+                "I couldn't find any relevant information in the selected folder's documents.",
+                [],
+                session_id,
+                streaming,
             )
 
-        reranked_nodes = get_reranker().rerank(request.query, retrieved_nodes)
+        reranked_nodes = await get_reranker().rerank(request.query, retrieved_nodes)
 
         # Filter by relevance threshold
         RELEVANCE_THRESHOLD = 0.05
-        reranked_nodes = [node for node in reranked_nodes if node.score >= RELEVANCE_THRESHOLD]
+        scores = np.fromiter(
+            (node.score for node in reranked_nodes), dtype=np.float32, count=len(reranked_nodes)
+        )
+        reranked_nodes = [reranked_nodes[i] for i in np.flatnonzero(scores >= RELEVANCE_THRESHOLD)]
 
         if not reranked_nodes:
-            return QueryResponse(
-                answer="I couldn't find any sufficiently relevant information in the documents to answer your question.",
-                sources=[],
-                session_id=session_id,
+            return _fixed_answer_response(
+                "I couldn't find any sufficiently relevant information in the documents to answer your question.",
+                [],
+                session_id,
+                streaming,
             )
 
-        conversation_history = memory.format_history_for_llm(session_id)
+        # The Redis memory backend does blocking network I/O, so keep it off the event loop
+        conversation_history = await asyncio.to_thread(memory.format_history_for_llm, session_id)
+
+        if streaming:
+            return StreamingResponse(
+                _stream_query_answer(
+                    request.query,
+                    reranked_nodes,
+                    conversation_history if conversation_history else None,
+                    session_id,
+                    query_embedding,
+                    request.folder_id,
+                ),
+                media_type="text/event-stream",
+            )
 
-        answer = generate_answer(
+        answer = await agenerate_answer(
             request.query,
             reranked_nodes,
             conversation_history if conversation_history else None,
@@ -343,8 +572,16 @@ async def query(request: QueryRequest):
 
         citations = extract_citations(reranked_nodes, request.query)
 
-        memory.add_message(session_id, "user", request.query)
-        memory.add_message(session_id, "assistant", answer, {"sources": citations})
+        # Memory and cache writes run after the response is sent
+        background_tasks.add_task(
+            _persist_turn,
+            session_id,
+            request.query,
+            answer,
+            citations,
+            query_embedding,
+            request.folder_id,
+        )
 
         return QueryResponse(
             answer=answer,
@@ -356,7 +593,7 @@ async def query(request: QueryRequest):
 
 
 @router.get("/sessions/{session_id}")
-async def get_history(session_id: str):
+async def get_history(session_id: str, http_request: Request):
     """Get conversation history for a session."""
-    history = memory.get_history(session_id)
-    return {"session_id": session_id, "history": history}
+    history = await asyncio.to_thread(memory.get_history, session_id)
+    return _etag_response(http_request, {"session_id": session_id, "history": history})
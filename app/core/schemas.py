@@ -16,9 +16,6 @@ class QueryResponse(BaseModel):
     session_id: str
 
 
-task_statuses: Dict[str, Dict] = {}
-
-
 class TaskStatus(str, Enum):
     PROCESSING = "processing"
     COMPLETED = "completed"
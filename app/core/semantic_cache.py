@@ -0,0 +1,131 @@
+"""Semantic cache for /query responses keyed by query embedding similarity."""
+
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.config import settings
+
+
+class SemanticCache:
+    """In-memory cache returning stored answers for near-duplicate queries.
+
+    Embeddings are stored L2-normalized in one preallocated float32 matrix with a row per
+    slot, so a lookup is a single matrix-vector product and a put overwrites a row in place.
+    Entries are scoped by (folder_id, session_id), expire after a TTL, and the least
+    recently used entry is replaced when the cache is full.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: int = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._matrix: Optional[np.ndarray] = None
+        self._entries: List[Optional[Dict]] = [None] * max_entries
+        self._expires_at = np.full(max_entries, -np.inf)
+        self._last_used = np.zeros(max_entries)
+        self._size = 0  # Slots [0, _size) have been used at least once
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        """Convert an embedding to a unit-length float32 vector."""
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def _allocate(self, dim: int) -> None:
+        """Allocate an empty matrix for embeddings of the given size."""
+        self._matrix = np.zeros((self.max_entries, dim), dtype=np.float32)
+        self._entries = [None] * self.max_entries
+        self._expires_at.fill(-np.inf)
+        self._last_used.fill(0.0)
+        self._size = 0
+
+    def _free_slot(self, now: float) -> int:
+        """Pick the slot for a new entry: unused, then expired, then least recently used."""
+        if self._size < self.max_entries:
+            self._size += 1
+            return self._size - 1
+
+        expired = np.flatnonzero(self._expires_at <= now)
+        if expired.size:
+            return int(expired[0])
+        return int(np.argmin(self._last_used))
+
+    def lookup(
+        self,
+        embedding: Sequence[float],
+        folder_id: Optional[str],
+        session_id: str,
+        threshold: float,
+    ) -> Optional[Dict]:
+        """Return the cached response for the most similar query in scope, if above threshold."""
+        query_vec = self._normalize(embedding)
+        scope = (folder_id, session_id)
+        now = time.time()
+
+        with self._lock:
+            n = self._size
+            if self._matrix is None or self._matrix.shape[1] != query_vec.shape[0]:
+                return None
+
+            in_scope = self._expires_at[:n] > now
+            in_scope &= np.fromiter(
+                (entry is not None and entry["scope"] == scope for entry in self._entries[:n]),
+                dtype=bool,
+                count=n,
+            )
+            if not in_scope.any():
+                return None
+
+            similarities = self._matrix[:n] @ query_vec
+            similarities[~in_scope] = -np.inf
+            best = int(np.argmax(similarities))
+            if similarities[best] < threshold:
+                return None
+
+            self._last_used[best] = now
+            return self._entries[best]["response"]
+
+    def put(
+        self,
+        embedding: Sequence[float],
+        folder_id: Optional[str],
+        session_id: str,
+        response: Dict,
+    ) -> None:
+        """Store a response for a query embedding."""
+        vec = self._normalize(embedding)
+        now = time.time()
+
+        with self._lock:
+            # First entry, or the embedding model changed and old vectors are not comparable
+            if self._matrix is None or self._matrix.shape[1] != vec.shape[0]:
+                self._allocate(vec.shape[0])
+
+            slot = self._free_slot(now)
+            self._matrix[slot] = vec
+            self._entries[slot] = {"scope": (folder_id, session_id), "response": response}
+            self._expires_at[slot] = now + self.ttl_seconds
+            self._last_used[slot] = now
+
+    def invalidate_folder(self, folder_id: Optional[str]) -> None:
+        """Drop entries that may be stale after documents were indexed into a folder."""
+        folder_id = str(folder_id) if folder_id is not None else None
+        with self._lock:
+            for slot, entry in enumerate(self._entries[: self._size]):
+                if entry is None:
+                    continue
+                # Unscoped queries search every folder, so they are always invalidated
+                entry_folder = entry["scope"][0]
+                if entry_folder is None or entry_folder == folder_id:
+                    self._entries[slot] = None
+                    self._expires_at[slot] = -np.inf
+
+
+semantic_cache = SemanticCache(
+    max_entries=settings.semantic_cache_max_entries,
+    ttl_seconds=settings.semantic_cache_ttl_seconds,
+)
@@ -1,6 +1,7 @@
 """SQLite-based task storage for multi-worker compatibility."""
 
 import sqlite3
+import threading
 
 import os
 from datetime import datetime
@@ -12,28 +13,43 @@ from app.core.schemas import TaskStatus
 
 DB_PATH = os.getenv("TASK_DB_PATH", "./task_store.db")
 
+# One connection per process, opened lazily. Writes are serialized with a lock;
+# reads can run concurrently under WAL.
+_conn: Optional[sqlite3.Connection] = None
+_conn_pid: Optional[int] = None
+_conn_lock = threading.Lock()
+_write_lock = threading.Lock()
+
 
 def _get_connection() -> sqlite3.Connection:
-    """Get a database connection."""
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get the shared database connection for this process."""
+    global _conn, _conn_pid
+
+    # A connection inherited through fork must not be reused by the child
+    if _conn is not None and _conn_pid == os.getpid():
+        return _conn
+
+    with _conn_lock:
+        if _conn is None or _conn_pid != os.getpid():
+            conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-20000")
+            _conn, _conn_pid = conn, os.getpid()
+    return _conn
 
 
 @contextmanager
 def get_db():
-    """Context manager for database connections."""
-    conn = _get_connection()
-    try:
-        yield conn
-        conn.commit()
-    finally:
-        conn.close()
+    """Context manager for the shared database connection (autocommit mode)."""
+    yield _get_connection()
 
 
 def init_db():
     """Initialize the database and create tables."""
-    with get_db() as conn:
+    with _write_lock, get_db() as conn:
         conn.execute("""
             CREATE TABLE IF NOT EXISTS tasks (
                 task_id TEXT PRIMARY KEY,
@@ -53,7 +69,7 @@ def init_db():
 def create_task(task_id: str, filename: str) -> Dict:
     """Create a new task record."""
     created_at = datetime.now().isoformat()
-    with get_db() as conn:
+    with _write_lock, get_db() as conn:
         conn.execute(
             """
             INSERT INTO tasks (task_id, status, filename, created_at, ok)
@@ -101,7 +117,7 @@ def get_task(task_id: str) -> Optional[Dict]:
 def complete_task(task_id: str, chunks: int, pages: int):
     """Mark a task as completed."""
     completed_at = datetime.now().isoformat()
-    with get_db() as conn:
+    with _write_lock, get_db() as conn:
         conn.execute(
             """
             UPDATE tasks
@@ -115,7 +131,7 @@ def complete_task(task_id: str, chunks: int, pages: int):
 def fail_task(task_id: str, error: str):
     """Mark a task as failed."""
     failed_at = datetime.now().isoformat()
-    with get_db() as conn:
+    with _write_lock, get_db() as conn:
         conn.execute(
             """
             UPDATE tasks
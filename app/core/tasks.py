@@ -1,10 +1,27 @@
+import asyncio
+import logging
+import uuid
+from itertools import islice
+from typing import List, Optional, Tuple
+
+from llama_index.core.schema import BaseNode
+
 from app.core.hybrid_retriever import HybridRetriever
+from app.core.ingest_pool import get_ingest_pool
 from app.core.reranker import CohereReranker
-from app.core.task_store import complete_task, fail_task
-from app.ingest.chunker import chunk_documents
+from app.core.semantic_cache import semantic_cache
+from app.core.task_store import complete_task, fail_task, get_task
+from app.ingest.chunker import chunk_documents, iter_chunks
 from app.ingest.index import index_manager
 from app.ingest.loaders import load_document
 
+# Chunks embedded and written per step when a document is indexed as a stream
+INDEX_BATCH_SIZE = 64
+# Chunks per step of aindex_nodes; aadd_documents splits each step into concurrent requests
+ASYNC_INDEX_BATCH_SIZE = 256
+
+logger = logging.getLogger("docuquery")
+
 _hybrid_retriever = None
 _reranker = None
 
@@ -25,6 +42,114 @@ def get_reranker() -> CohereReranker:
     return _reranker
 
 
+async def get_query_embedding(query: str) -> Optional[List[float]]:
+    """Embed a query with the index's embedding model, or return None if that fails."""
+    try:
+        return await index_manager.get_embed_model().aget_query_embedding(query)
+    except Exception:
+        return None
+
+
+def _tag_nodes(
+    nodes: List[BaseNode],
+    folder_id: str = None,
+    document_id: str = None,
+    original_filename: str = None,
+) -> None:
+    """Add folder_id, document_id, and override file_name with the original filename."""
+    for node in nodes:
+        if folder_id:
+            node.metadata["folder_id"] = str(folder_id)
+        if document_id:
+            node.metadata["document_id"] = str(document_id)
+        # Override UUID-based filename with original user-facing filename
+        if original_filename:
+            node.metadata["file_name"] = original_filename
+
+
+def _page_count(documents: List) -> int:
+    """Page count recorded by the loader, or the number of loaded documents."""
+    return documents[0].metadata.get("total_pages", len(documents)) if documents else 0
+
+
+def load_and_chunk_document(
+    file_path: str,
+    folder_id: str = None,
+    document_id: str = None,
+    original_filename: str = None,
+) -> Tuple[List[BaseNode], int]:
+    """Load and chunk a document, returning its nodes and page count.
+
+    This is the CPU-heavy part of ingestion and is safe to run in a separate process.
+    """
+    documents = load_document(file_path)
+    nodes = chunk_documents(documents)
+    _tag_nodes(nodes, folder_id, document_id, original_filename)
+
+    return nodes, _page_count(documents)
+
+
+def index_nodes(nodes: List[BaseNode], folder_id: str = None) -> None:
+    """Embed nodes into the vector index and make them searchable in this process."""
+    index_manager.add_documents(nodes)
+    get_hybrid_retriever().add_nodes(nodes)
+    semantic_cache.invalidate_folder(folder_id)
+
+
+async def aindex_nodes(nodes: List[BaseNode], folder_id: str = None) -> None:
+    """Async variant of index_nodes that embeds and writes ASYNC_INDEX_BATCH_SIZE nodes at a time.
+
+    Embeddings are dropped once written, so a large document never holds all of them at
+    once. If a step fails, the steps already written are deleted again.
+    """
+    written = []
+    try:
+        for start in range(0, len(nodes), ASYNC_INDEX_BATCH_SIZE):
+            batch = nodes[start : start + ASYNC_INDEX_BATCH_SIZE]
+            await index_manager.aadd_documents(batch)
+            written.extend(node.node_id for node in batch)
+            for node in batch:
+                # Stored in Chroma now; BM25 only needs the text
+                node.embedding = None
+    except BaseException:
+        await asyncio.to_thread(index_manager.delete_nodes, written)
+        raise
+
+    # BM25 recomputes IDF for every term on each add, so add the document once
+    await asyncio.to_thread(get_hybrid_retriever().add_nodes, nodes)
+    semantic_cache.invalidate_folder(folder_id)
+
+
+def copy_document_chunks(
+    source_document_id: str,
+    folder_id: str = None,
+    document_id: str = None,
+    original_filename: str = None,
+) -> int:
+    """Index copies of an already embedded document's chunks under a new document.
+
+    The stored embeddings are reused, so nothing is re-embedded. Returns the number of
+    chunks copied, which is 0 if the source document has none in the index.
+    """
+    nodes = index_manager.get_document_nodes(source_document_id)
+    if not nodes:
+        return 0
+
+    for node in nodes:
+        node.id_ = str(uuid.uuid4())
+        if folder_id:
+            node.metadata["folder_id"] = str(folder_id)
+        if document_id:
+            node.metadata["document_id"] = str(document_id)
+        if original_filename:
+            node.metadata["file_name"] = original_filename
+
+    index_manager.add_documents(nodes)
+    get_hybrid_retriever().add_nodes(nodes)
+    semantic_cache.invalidate_folder(folder_id)
+    return len(nodes)
+
+
 def process_and_index_document(
     file_path: str,
     task_id: str,
@@ -35,30 +160,89 @@ def process_and_index_document(
     """Process document and create embeddings in background."""
     try:
         documents = load_document(file_path)
-        nodes = chunk_documents(documents)
-
-        # Add folder_id, document_id, and override file_name with original filename
-        for node in nodes:
-            if folder_id:
-                node.metadata["folder_id"] = str(folder_id)
-            if document_id:
-                node.metadata["document_id"] = str(document_id)
-            # Override UUID-based filename with original user-facing filename
-            if original_filename:
-                node.metadata["file_name"] = original_filename
-
-        index_manager.add_documents(nodes)
-        get_hybrid_retriever().add_nodes(nodes)
-
-        page_count = (
-            documents[0].metadata.get(
-                "total_pages",
-                len(documents),
-            )
-            if documents
-            else 0
+        page_count = _page_count(documents)
+
+        # Chunk, embed and write INDEX_BATCH_SIZE nodes at a time, so a large document
+        # never holds all of its embeddings at once
+        node_iter = iter_chunks(documents)
+        indexed = []
+        try:
+            while batch := list(islice(node_iter, INDEX_BATCH_SIZE)):
+                _tag_nodes(batch, folder_id, document_id, original_filename)
+                index_manager.add_documents(batch)
+                for node in batch:
+                    # Stored in Chroma now; BM25 only needs the text
+                    node.embedding = None
+                indexed.extend(batch)
+        except Exception:
+            # Don't leave part of a failed document in the vector store
+            index_manager.delete_nodes([node.node_id for node in indexed])
+            raise
+
+        # BM25 recomputes IDF for every term on each add, so add the document once
+        get_hybrid_retriever().add_nodes(indexed)
+        semantic_cache.invalidate_folder(folder_id)
+
+        complete_task(task_id, chunks=len(indexed), pages=page_count)
+    except Exception as e:
+        fail_task(task_id, error=str(e))
+
+
+async def aprocess_and_index_document(
+    file_path: str,
+    task_id: str,
+    folder_id: str = None,
+    document_id: str = None,
+    original_filename: str = None,
+):
+    """Process document with loading and chunking offloaded to the ingest process pool.
+
+    Embedding and vector-store writes stay in this process: the Chroma client is not
+    shared across processes, and the in-process BM25 index must see the new nodes.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        nodes, page_count = await loop.run_in_executor(
+            get_ingest_pool(),
+            load_and_chunk_document,
+            file_path,
+            folder_id,
+            document_id,
+            original_filename,
         )
+        await aindex_nodes(nodes, folder_id)
 
         complete_task(task_id, chunks=len(nodes), pages=page_count)
     except Exception as e:
         fail_task(task_id, error=str(e))
+
+
+async def acopy_or_index_document(
+    source_document_id: str,
+    source_task_id: Optional[str],
+    file_path: str,
+    task_id: str,
+    folder_id: str = None,
+    document_id: str = None,
+    original_filename: str = None,
+):
+    """Index a duplicate upload by copying the source document's chunks.
+
+    Falls back to full processing if the source chunks can't be copied.
+    """
+    try:
+        chunks = await asyncio.to_thread(
+            copy_document_chunks, source_document_id, folder_id, document_id, original_filename
+        )
+    except Exception:
+        logger.exception(f"Failed to copy chunks of document {source_document_id}")
+        chunks = 0
+
+    if not chunks:
+        await aprocess_and_index_document(
+            file_path, task_id, folder_id, document_id, original_filename
+        )
+        return
+
+    source_task = get_task(source_task_id) if source_task_id else None
+    complete_task(task_id, chunks=chunks, pages=(source_task or {}).get("pages", 0))
@@ -0,0 +1,97 @@
+"""Embedding through the OpenAI Batch API for large, latency-insensitive ingests.
+
+Batch jobs cost about half as much as interactive embedding calls but may take up to
+24 hours, so they are only worth it for backfills of many documents.
+"""
+
+import io
+import json
+import time
+from typing import List, Optional
+
+from llama_index.core.schema import BaseNode, MetadataMode
+from openai import OpenAI
+
+from app.config import settings
+
+# The Batch API accepts at most this many requests per input file
+MAX_BATCH_REQUESTS = 50_000
+BATCH_POLL_SECONDS = 30
+
+_client: Optional[OpenAI] = None
+
+
+def get_client() -> OpenAI:
+    """Get or create the OpenAI client used for batch jobs."""
+    global _client
+    if _client is None:
+        _client = OpenAI(api_key=settings.openai_api_key)
+    return _client
+
+
+def submit_batch(texts: List[str], model: str = None) -> str:
+    """Submit texts as one batch embedding job and return its batch id."""
+    if len(texts) > MAX_BATCH_REQUESTS:
+        raise ValueError(f"A batch holds at most {MAX_BATCH_REQUESTS} texts, got {len(texts)}")
+
+    model = model or settings.embedding_model
+    lines = (
+        json.dumps(
+            {
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/embeddings",
+                "body": {"model": model, "input": text},
+            }
+        )
+        for i, text in enumerate(texts)
+    )
+    payload = io.BytesIO("\n".join(lines).encode())
+
+    client = get_client()
+    input_file = client.files.create(file=("embeddings.jsonl", payload), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/embeddings",
+        completion_window="24h",
+    )
+    return batch.id
+
+
+def wait_for_batch(batch_id: str, count: int) -> List[List[float]]:
+    """Block until a batch finishes and return its embeddings in submission order."""
+    client = get_client()
+
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status == "completed":
+            break
+        if batch.status in ("failed", "expired", "cancelled"):
+            raise RuntimeError(f"Embedding batch {batch_id} ended with status {batch.status}")
+        time.sleep(BATCH_POLL_SECONDS)
+
+    embeddings: List[Optional[List[float]]] = [None] * count
+    if batch.output_file_id:
+        output = client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            result = json.loads(line)
+            response = result.get("response") or {}
+            if response.get("status_code") == 200:
+                embeddings[int(result["custom_id"])] = response["body"]["data"][0]["embedding"]
+
+    failed = sum(embedding is None for embedding in embeddings)
+    if failed:
+        raise RuntimeError(f"Embedding batch {batch_id} is missing {failed} of {count} results")
+    return embeddings
+
+
+def embed_nodes_via_batch(nodes: List[BaseNode]) -> None:
+    """Set embeddings on nodes that have none, using Batch API jobs."""
+    pending = [node for node in nodes if node.embedding is None]
+
+    for start in range(0, len(pending), MAX_BATCH_REQUESTS):
+        chunk = pending[start : start + MAX_BATCH_REQUESTS]
+        texts = [node.get_content(metadata_mode=MetadataMode.EMBED) for node in chunk]
+        embeddings = wait_for_batch(submit_batch(texts), len(texts))
+        for node, embedding in zip(chunk, embeddings):
+            node.embedding = embedding
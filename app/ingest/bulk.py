@@ -0,0 +1,46 @@
+"""Bulk ingestion of a directory of documents, for backfills outside the upload API.
+
+Usage: python -m app.ingest.bulk DIRECTORY [--folder-id ID] [--mode batch|interactive]
+"""
+
+import argparse
+from typing import Optional
+
+from app.ingest.batch_embed import embed_nodes_via_batch
+from app.ingest.chunker import chunk_documents
+from app.ingest.index import index_manager
+from app.ingest.loaders import load_documents_from_directory
+
+
+def ingest_directory(directory: str, folder_id: Optional[str] = None, mode: str = "batch") -> int:
+    """Load, chunk, embed and store every supported document in a directory.
+
+    With mode="batch", embeddings come from the OpenAI Batch API, which is cheaper but can
+    take hours. Nodes are only written to the vector store, so a running server picks them
+    up for keyword search after a restart. Returns the number of chunks stored.
+    """
+    documents = load_documents_from_directory(directory)
+    nodes = chunk_documents(documents)
+    if folder_id:
+        for node in nodes:
+            node.metadata["folder_id"] = str(folder_id)
+
+    if mode == "batch":
+        embed_nodes_via_batch(nodes)
+    index_manager.add_documents(nodes)
+    return len(nodes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingest a directory of documents.")
+    parser.add_argument("directory")
+    parser.add_argument("--folder-id", help="folder the documents are searchable under")
+    parser.add_argument("--mode", choices=["batch", "interactive"], default="batch")
+    args = parser.parse_args()
+
+    chunks = ingest_directory(args.directory, args.folder_id, args.mode)
+    print(f"Indexed {chunks} chunks from {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
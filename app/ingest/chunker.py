@@ -1,5 +1,6 @@
 import re
-from typing import List
+import unicodedata
+from typing import Iterable, Iterator, List
 
 from langchain_experimental.text_splitter import SemanticChunker
 from langchain_openai.embeddings import OpenAIEmbeddings
@@ -8,6 +9,10 @@ from llama_index.core.schema import BaseNode, TextNode
 
 from app.config import settings
 
+_RE_SEPARATORS = re.compile(r"([=\-_*]){3,}")
+
+_text_splitter = None
+
 
 def normalize_text(text: str) -> str:
     """
@@ -17,58 +22,56 @@ def normalize_text(text: str) -> str:
     if not text:
         return ""
 
-    text = re.sub(r"([=\-_*]){3,}", " ", text)
-    text = re.sub(r"[\n\r\t]+", " ", text)
-    text = re.sub(r"\s{2,}", " ", text)
+    # NFKC folds compatibility characters (ligatures, full-width forms, non-breaking
+    # spaces) so the same word always embeds and tokenizes the same way
+    text = unicodedata.normalize("NFKC", text)
+    text = _RE_SEPARATORS.sub(" ", text)
 
-    return text.strip()
+    # Collapses every whitespace run, line breaks included, and trims the ends
+    return " ".join(text.split())
 
 
-def chunk_documents(documents: List[Document]) -> List[BaseNode]:
-    """Chunk documents with metadata preservation using semantic chunking."""
-    text_splitter = SemanticChunker(
-        OpenAIEmbeddings(api_key=settings.openai_api_key),
-        breakpoint_threshold_type="percentile",  # "standard_deviation", "interquartile"
-    )
+def get_text_splitter() -> SemanticChunker:
+    """Get or create the semantic chunker, reusing its embeddings client across calls."""
+    global _text_splitter
+    if _text_splitter is None:
+        _text_splitter = SemanticChunker(
+            OpenAIEmbeddings(api_key=settings.openai_api_key, chunk_size=1000, max_retries=3),
+            breakpoint_threshold_type="percentile",  # "standard_deviation", "interquartile"
+        )
+    return _text_splitter
 
-    nodes = []
-    char_position_map = {}
 
-    for doc in documents:
-        text = normalize_text(doc.get_content())
-        doc_metadata = doc.metadata.copy() if doc.metadata else {}
+def iter_chunks(documents: Iterable[Document]) -> Iterator[BaseNode]:
+    """Chunk documents lazily with semantic chunking, one document at a time."""
+    text_splitter = get_text_splitter()
 
-        langchain_docs = text_splitter.create_documents([text])
+    # Running character offset within the current file; a file's chunks arrive consecutively
+    current_file = None
+    pos = 0
 
-        for langchain_doc in langchain_docs:
-            node_metadata = doc_metadata.copy()
-            if langchain_doc.metadata:
-                node_metadata.update(langchain_doc.metadata)
-
-            node = TextNode(
-                text=langchain_doc.page_content,
-                metadata=node_metadata,
-            )
+    for doc in documents:
+        doc_metadata = doc.metadata or {}
+        if "file_name" not in doc_metadata:
+            doc_metadata = {**doc_metadata, "file_name": "unknown"}
 
-            if not node.metadata:
-                node.metadata = {}
+        # split_text instead of create_documents, which deep-copies the metadata per chunk.
+        # TextNode validation already gives each node its own shallow copy of the dict.
+        for chunk_text in text_splitter.split_text(normalize_text(doc.get_content())):
+            node = TextNode(text=chunk_text, metadata=doc_metadata)
 
-            if "file_name" not in node.metadata:
-                node.metadata["file_name"] = doc_metadata.get("file_name", "unknown")
+            doc_name = node.metadata["file_name"]
+            if doc_name != current_file:
+                current_file, pos = doc_name, 0
 
-            doc_name = node.metadata.get("file_name", "unknown")
+            if node.metadata.get("start_char_idx") is None:
+                node.metadata["start_char_idx"] = pos
 
-            if (
-                "start_char_idx" not in node.metadata
-                or node.metadata["start_char_idx"] is None
-            ):
-                if doc_name not in char_position_map:
-                    char_position_map[doc_name] = 0
-                node.metadata["start_char_idx"] = char_position_map[doc_name]
+            pos = node.metadata["start_char_idx"] + len(node.get_content())
 
-            chunk_length = len(node.get_content())
-            char_position_map[doc_name] = node.metadata["start_char_idx"] + chunk_length
+            yield node
 
-            nodes.append(node)
 
-    return nodes
+def chunk_documents(documents: List[Document]) -> List[BaseNode]:
+    """Chunk documents with metadata preservation using semantic chunking."""
+    return list(iter_chunks(documents))
@@ -0,0 +1,143 @@
+"""Persistent cache of chunk embeddings keyed by content hash."""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from cachetools import LRUCache
+from llama_index.embeddings.openai import OpenAIEmbedding
+
+from app.config import settings
+
+# SQLite caps the number of bound parameters per statement
+_LOOKUP_BATCH = 500
+
+
+class EmbeddingCache:
+    """SQLite-backed map from SHA-256(model, text) to a float32 embedding.
+
+    An in-process LRU sits in front of the database for hot texts.
+    """
+
+    def __init__(self, db_path: str, memory_entries: int = 4096):
+        self.db_path = db_path
+        self._memory: LRUCache = LRUCache(maxsize=memory_entries)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        """Cache key for a text embedded with the given model."""
+        return hashlib.sha256(f"{model}\0{text}".encode()).digest()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this process's connection, creating the table on first use. Caller holds the lock."""
+        # A connection inherited through fork must not be reused by the child
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    hash BLOB PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    dim INTEGER NOT NULL,
+                    vec BLOB NOT NULL
+                )
+            """)
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    def get_many(self, keys: Sequence[bytes]) -> Dict[bytes, List[float]]:
+        """Return the cached embeddings for whichever keys are present."""
+        found = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                vec = self._memory.get(key)
+                if vec is None:
+                    missing.append(key)
+                else:
+                    found[key] = vec
+
+            conn = self._connection() if missing else None
+            for start in range(0, len(missing), _LOOKUP_BATCH):
+                batch = missing[start : start + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT hash, vec FROM embeddings WHERE hash IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    vec = np.frombuffer(blob, dtype=np.float32).tolist()
+                    self._memory[key] = vec
+                    found[key] = vec
+        return found
+
+    def put_many(self, model: str, embeddings: Dict[bytes, List[float]]) -> None:
+        """Store embeddings computed with the given model."""
+        rows = [
+            (key, model, len(vec), np.asarray(vec, dtype=np.float32).tobytes())
+            for key, vec in embeddings.items()
+        ]
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)", rows)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self._memory.update(embeddings)
+
+
+embedding_cache = EmbeddingCache(settings.embedding_cache_path)
+
+
+class CachedOpenAIEmbedding(OpenAIEmbedding):
+    """OpenAI embedding model that only calls the API for texts not embedded before."""
+
+    def _lookup(self, texts: List[str]):
+        """Split texts into cached vectors and the positions that still need embedding."""
+        keys = [embedding_cache.key(self.model_name, text) for text in texts]
+        cached = embedding_cache.get_many(keys)
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        return keys, cached, missing
+
+    def _merge(
+        self,
+        keys: List[bytes],
+        cached: Dict[bytes, List[float]],
+        missing: List[int],
+        fresh: List[List[float]],
+    ) -> List[List[float]]:
+        """Store freshly computed vectors and return all vectors in input order."""
+        new = {keys[i]: vec for i, vec in zip(missing, fresh)}
+        if new:
+            embedding_cache.put_many(self.model_name, new)
+            cached.update(new)
+        return [cached[key] for key in keys]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        keys, cached, missing = self._lookup(texts)
+        fresh = super()._get_text_embeddings([texts[i] for i in missing]) if missing else []
+        return self._merge(keys, cached, missing, fresh)
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        # SQLite queries and commits block, and may wait on the cache lock held by a sync caller
+        keys, cached, missing = await asyncio.to_thread(self._lookup, texts)
+        fresh = (
+            await super()._aget_text_embeddings([texts[i] for i in missing]) if missing else []
+        )
+        return await asyncio.to_thread(self._merge, keys, cached, missing, fresh)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._get_text_embeddings([text])[0]
+
+    async def _aget_text_embedding(self, text: str) -> List[float]:
+        return (await self._aget_text_embeddings([text]))[0]
@@ -1,13 +1,28 @@
+import asyncio
 import os
+import threading
 from typing import List, Optional
 
 import chromadb
+import numpy as np
 from llama_index.core import StorageContext, VectorStoreIndex
-from llama_index.core.schema import BaseNode
+from llama_index.core.schema import BaseNode, MetadataMode
+from llama_index.core.vector_stores.utils import metadata_dict_to_node, node_to_metadata_dict
 from llama_index.embeddings.openai import OpenAIEmbedding
 from llama_index.vector_stores.chroma import ChromaVectorStore
 
 from app.config import settings
+from app.ingest.embed_cache import CachedOpenAIEmbedding
+
+# Nodes per embedding request / vector-store write when indexing asynchronously
+ASYNC_INSERT_BATCH_SIZE = 64
+# Embedding requests in flight at once per indexing call
+ASYNC_INSERT_CONCURRENCY = 3
+# Chroma metadata key holding the app's document id. node_to_metadata_dict overwrites the
+# top-level "document_id" key with the node's ref_doc_id, which chunker nodes don't have.
+SOURCE_DOCUMENT_ID_KEY = "source_document_id"
+
+_init_lock = threading.Lock()
 
 
 class IndexManager:
@@ -17,6 +32,7 @@ class IndexManager:
     _index: Optional[VectorStoreIndex] = None
     _client: Optional[chromadb.Client] = None
     _collection: Optional[chromadb.Collection] = None
+    _embed_model: Optional[OpenAIEmbedding] = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -24,51 +40,169 @@ class IndexManager:
         return cls._instance
 
     def initialize(self) -> VectorStoreIndex:
-        """Initialize or load the index."""
+        """Initialize or load the index.
+
+        Called once at application startup; the lock keeps concurrent lazy callers (scripts,
+        ingest threads) from opening the Chroma client twice.
+        """
         if self._index is not None:
             return self._index
 
-        os.makedirs(settings.chroma_db_path, exist_ok=True)
+        with _init_lock:
+            if self._index is not None:
+                return self._index
 
-        self._client = chromadb.PersistentClient(path=settings.chroma_db_path)
+            os.makedirs(settings.chroma_db_path, exist_ok=True)
 
-        try:
-            self._collection = self._client.get_collection("docuquery")
-        except Exception:
-            self._collection = self._client.create_collection("docuquery")
+            self._client = chromadb.PersistentClient(path=settings.chroma_db_path)
 
-        embed_model = OpenAIEmbedding(
-            model=settings.embedding_model,
-            api_key=settings.openai_api_key,
-        )
+            try:
+                self._collection = self._client.get_collection("docuquery")
+            except Exception:
+                self._collection = self._client.create_collection("docuquery")
 
-        vector_store = ChromaVectorStore(chroma_collection=self._collection)
-        storage_context = StorageContext.from_defaults(vector_store=vector_store)
+            # Chunks embedded before (re-uploads, repeated boilerplate) are served from the cache
+            embed_model = CachedOpenAIEmbedding(
+                model=settings.embedding_model,
+                api_key=settings.openai_api_key,
+                embed_batch_size=100,
+            )
+            self._embed_model = embed_model
+
+            vector_store = ChromaVectorStore(chroma_collection=self._collection)
+            storage_context = StorageContext.from_defaults(vector_store=vector_store)
+
+            # Check if collection has existing data
+            if self._collection.count() > 0:
+                # Load existing index from vector store
+                self._index = VectorStoreIndex.from_vector_store(
+                    vector_store=vector_store,
+                    embed_model=embed_model,
+                )
+            else:
+                # Create new empty index
+                self._index = VectorStoreIndex(
+                    nodes=[],
+                    storage_context=storage_context,
+                    embed_model=embed_model,
+                )
+
+            return self._index
 
-        # Check if collection has existing data
-        if self._collection.count() > 0:
-            # Load existing index from vector store
-            self._index = VectorStoreIndex.from_vector_store(
-                vector_store=vector_store,
-                embed_model=embed_model,
+    def add_documents(self, nodes: List[BaseNode]) -> None:
+        """Add documents to the existing index.
+
+        Nodes are embedded in batches and written to the vector store in one call; nodes
+        that already carry an embedding are not re-embedded.
+        """
+        if self._index is None:
+            self.initialize()
+
+        pending = [node for node in nodes if node.embedding is None]
+        if pending:
+            embeddings = self._embed_model.get_text_embedding_batch(
+                [node.get_content(metadata_mode=MetadataMode.EMBED) for node in pending]
             )
-        else:
-            # Create new empty index
-            self._index = VectorStoreIndex(
-                nodes=[],
-                storage_context=storage_context,
-                embed_model=embed_model,
+            for node, embedding in zip(pending, embeddings):
+                node.embedding = embedding
+
+        self._write_nodes(nodes)
+
+    def _write_nodes(self, nodes: List[BaseNode]) -> None:
+        """Write embedded nodes straight to the Chroma collection.
+
+        Metadata is serialized the way ChromaVectorStore does it, so the nodes read back
+        the same through the index and get_document_nodes.
+        """
+        max_batch = self._client.get_max_batch_size()
+        for start in range(0, len(nodes), max_batch):
+            batch = nodes[start : start + max_batch]
+
+            # One contiguous (n, dim) float32 matrix, which Chroma takes as is, instead of a
+            # Python list per vector that the client would convert one by one
+            vectors = np.empty((len(batch), len(batch[0].embedding)), dtype=np.float32)
+            for row, node in enumerate(batch):
+                vectors[row] = node.embedding
+
+            self._collection.add(
+                ids=[node.node_id for node in batch],
+                embeddings=vectors,
+                documents=[node.get_content(metadata_mode=MetadataMode.NONE) for node in batch],
+                metadatas=[self._chroma_metadata(node) for node in batch],
             )
 
-        return self._index
+    @staticmethod
+    def _chroma_metadata(node: BaseNode) -> dict:
+        """Flat Chroma metadata for a node, tagged with the app's document id if it has one."""
+        metadata = node_to_metadata_dict(node, remove_text=True, flat_metadata=True)
+        document_id = node.metadata.get("document_id")
+        if document_id:
+            metadata[SOURCE_DOCUMENT_ID_KEY] = str(document_id)
+        return metadata
+
+    async def aadd_documents(self, nodes: List[BaseNode]) -> None:
+        """Add documents to the index, embedding batches concurrently.
+
+        Up to ASYNC_INSERT_CONCURRENCY embedding requests are in flight at once. Nothing is
+        written until every batch is embedded, so a failed embedding leaves no partial
+        document in the vector store.
+        """
+        if self._index is None:
+            await asyncio.to_thread(self.initialize)
+
+        semaphore = asyncio.Semaphore(ASYNC_INSERT_CONCURRENCY)
+
+        async def embed(batch: List[BaseNode]) -> None:
+            async with semaphore:
+                embeddings = await self._embed_model.aget_text_embedding_batch(
+                    [node.get_content(metadata_mode=MetadataMode.EMBED) for node in batch]
+                )
+            for node, embedding in zip(batch, embeddings):
+                node.embedding = embedding
+
+        pending = [node for node in nodes if node.embedding is None]
+        tasks = [
+            asyncio.ensure_future(embed(pending[start : start + ASYNC_INSERT_BATCH_SIZE]))
+            for start in range(0, len(pending), ASYNC_INSERT_BATCH_SIZE)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Stop the remaining embedding requests; the document is failing anyway
+            for task in tasks:
+                task.cancel()
+            raise
+
+        # Chroma's client is synchronous; every node has an embedding by now
+        await asyncio.to_thread(self._write_nodes, nodes)
+
+    def delete_nodes(self, node_ids: List[str]) -> None:
+        """Delete nodes from the vector store by id."""
+        if self._index is None:
+            self.initialize()
 
-    def add_documents(self, nodes: List[BaseNode]) -> None:
-        """Add documents to the existing index."""
+        max_batch = self._client.get_max_batch_size()
+        for start in range(0, len(node_ids), max_batch):
+            self._collection.delete(ids=node_ids[start : start + max_batch])
+
+    def get_document_nodes(self, document_id: str) -> List[BaseNode]:
+        """Load a document's stored chunks, with their embeddings, from the vector store."""
         if self._index is None:
             self.initialize()
 
-        for node in nodes:
-            self._index.insert(node)
+        result = self._collection.get(
+            where={SOURCE_DOCUMENT_ID_KEY: str(document_id)},
+            include=["documents", "metadatas", "embeddings"],
+        )
+
+        nodes = []
+        for text, metadata, embedding in zip(
+            result["documents"], result["metadatas"], result["embeddings"]
+        ):
+            node = metadata_dict_to_node(metadata, text=text)
+            node.embedding = list(map(float, embedding))
+            nodes.append(node)
+        return nodes
 
     def get_index(self) -> VectorStoreIndex:
         """Get the current index instance."""
@@ -76,6 +210,12 @@ class IndexManager:
             self.initialize()
         return self._index
 
+    def get_embed_model(self) -> OpenAIEmbedding:
+        """Get the embedding model used by the index."""
+        if self._index is None:
+            self.initialize()
+        return self._embed_model
+
     def reset(self) -> None:
         """Reset the index (for testing)."""
         if self._client is not None:
@@ -87,6 +227,7 @@ class IndexManager:
         self._index = None
         self._collection = None
         self._client = None
+        self._embed_model = None
 
 
 index_manager = IndexManager()
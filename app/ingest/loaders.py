@@ -1,9 +1,52 @@
-import os
+import mmap
 from pathlib import Path
 from typing import List
 
+import pypdfium2 as pdfium
 from llama_index.core import Document, SimpleDirectoryReader
-from llama_index.readers.file import DocxReader, PDFReader
+from llama_index.readers.file import DocxReader
+
+
+def _load_pdf(path: Path) -> List[Document]:
+    """Extract text from a PDF with PDFium, one Document per page.
+
+    PDFium is not thread-safe, so pages are read sequentially; documents are already
+    loaded in parallel across the ingest process pool.
+    """
+    pdf = pdfium.PdfDocument(str(path))
+    try:
+        docs = []
+        for i in range(len(pdf)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            try:
+                text = textpage.get_text_range()
+            finally:
+                textpage.close()
+                page.close()
+
+            docs.append(
+                Document(
+                    text=text,
+                    metadata={"page_label": pdf.get_page_label(i) or str(i + 1)},
+                )
+            )
+        return docs
+    finally:
+        pdf.close()
+
+
+def _read_text(path: Path, size: int) -> str:
+    """Read a UTF-8 text file of the given size by decoding straight from a memory map.
+
+    This skips the intermediate bytes copy of a buffered read, so peak memory is roughly
+    the decoded string alone.
+    """
+    if size == 0:
+        return ""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return str(mm, "utf-8")
 
 
 def load_document(file_path: str) -> List[Document]:
@@ -11,15 +54,16 @@ def load_document(file_path: str) -> List[Document]:
     path = Path(file_path)
     file_ext = path.suffix.lower()
 
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File not found: {file_path}")
+    try:
+        file_size = path.stat().st_size
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {file_path}") from None
 
     documents = []
     page_count = 0
 
     if file_ext == ".pdf":
-        loader = PDFReader()
-        docs = loader.load_data(file=Path(file_path))
+        docs = _load_pdf(path)
         for i, doc in enumerate(docs):
             doc.metadata["file_name"] = path.name
             doc.metadata["file_type"] = "pdf"
@@ -29,7 +73,7 @@ def load_document(file_path: str) -> List[Document]:
 
     elif file_ext in [".docx", ".doc"]:
         loader = DocxReader()
-        docs = loader.load_data(file=Path(file_path))
+        docs = loader.load_data(file=path)
         for doc in docs:
             doc.metadata["file_name"] = path.name
             doc.metadata["file_type"] = "docx"
@@ -40,8 +84,7 @@ def load_document(file_path: str) -> List[Document]:
         )
 
     elif file_ext == ".txt":
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        content = _read_text(path, file_size)
         doc = Document(
             text=content,
             metadata={
@@ -1,3 +1,6 @@
+import asyncio
+import os
+
 import uvicorn
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
@@ -6,10 +9,13 @@ from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from app.core.logging import logger, setup_logging
+from app.core.middleware import DocumentAwareGZipMiddleware
 from app.core.rate_limit import limiter
 from app.core.routers import router
 from app.auth.auth_router import auth_router
 from app.core.database import init_db
+from app.core.ingest_pool import shutdown_ingest_pool
+from app.ingest.index import index_manager
 
 # Setup logging
 setup_logging()
@@ -22,9 +28,13 @@ async def lifespan(app: FastAPI):
     logger.info("DocuQuery API starting up...")
     init_db()
     logger.info("Database initialized")
+    # Open Chroma and build the embedding client before the first request needs them
+    await asyncio.to_thread(index_manager.initialize)
+    logger.info("Vector index initialized")
     yield
     # Shutdown
     logger.info("DocuQuery API shutting down...")
+    shutdown_ingest_pool()
 
 
 app = FastAPI(
@@ -60,6 +70,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON responses; small bodies are not worth the CPU
+app.add_middleware(DocumentAwareGZipMiddleware, minimum_size=512)
+
 app.include_router(router)
 app.include_router(auth_router)
 
@@ -72,4 +85,17 @@ def health_check():
 
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    reload = os.getenv("DEV_RELOAD") == "1"
+    # Defaults to one worker: the BM25 index, semantic cache and (without Redis) conversation
+    # memory live in process, so extra workers would each hold a separate copy
+    workers = 1 if reload else int(os.getenv("WEB_CONCURRENCY", "1"))
+    # loop/http "auto" pick uvloop and httptools when installed (uvicorn[standard])
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=reload,
+        workers=workers,
+        loop="auto",
+        http="auto",
+    )
@@ -0,0 +1,37 @@
+"""add_verification_token_index
+
+Revision ID: 8f2d4c1a9b7e
+Revises: 5c0385037bf6
+Create Date: 2026-10-15 10:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2d4c1a9b7e'
+down_revision: Union[str, None] = '5c0385037bf6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Partial index: only unverified users carry a token worth looking up
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f('ix_users_verification_token'),
+            ['verification_token'],
+            unique=False,
+            postgresql_where=sa.text('verification_token IS NOT NULL'),
+            sqlite_where=sa.text('verification_token IS NOT NULL'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_verification_token'))
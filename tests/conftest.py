@@ -0,0 +1,19 @@
+import pytest
+
+from app.config import settings
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """A fresh IndexManager backed by a Chroma database in a temporary directory."""
+    pytest.importorskip("chromadb")
+    from app.ingest.index import IndexManager
+
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(settings, "chroma_db_path", str(tmp_path / "chroma"))
+    monkeypatch.setattr(settings, "embedding_cache_path", str(tmp_path / "embeddings.db"))
+    manager = IndexManager()
+    manager.reset()
+    manager.initialize()
+    yield manager
+    manager.reset()
@@ -0,0 +1,22 @@
+import numpy as np
+from rank_bm25 import BM25Okapi
+
+from app.core.bm25 import IncrementalBM25Okapi
+
+
+def test_incremental_adds_score_like_a_full_rebuild():
+    corpus = [
+        ["the", "cat", "sat"],
+        ["the", "dog", "ran", "far"],
+        ["a", "cat", "and", "a", "dog"],
+        ["the", "the", "the"],
+        ["bird"],
+        ["cat", "bird", "dog", "the"],
+    ]
+    bm25 = IncrementalBM25Okapi(corpus[:2])
+    bm25.add_documents(corpus[2:3])
+    bm25.add_documents(corpus[3:])
+
+    expected = BM25Okapi(corpus)
+    for query in (["cat"], ["the", "dog"], ["bird", "missing"]):
+        assert np.allclose(bm25.get_scores(query), expected.get_scores(query))
@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip("chromadb")
+
+from llama_index.core.schema import TextNode
+
+from app.ingest import bulk
+
+
+def test_ingest_directory_embeds_through_batch_api(manager, tmp_path, monkeypatch):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "a.txt").write_text("alpha")
+    (tmp_path / "docs" / "b.txt").write_text("beta")
+    submitted = []
+
+    def embed_nodes_via_batch(nodes):
+        submitted.extend(nodes)
+        for node in nodes:
+            node.embedding = [1.0, 0.0, 0.0]
+
+    monkeypatch.setattr(bulk, "index_manager", manager)
+    monkeypatch.setattr(
+        bulk, "chunk_documents", lambda documents: [TextNode(text=d.text) for d in documents]
+    )
+    monkeypatch.setattr(bulk, "embed_nodes_via_batch", embed_nodes_via_batch)
+
+    chunks = bulk.ingest_directory(str(tmp_path / "docs"), folder_id="folder-1")
+
+    assert chunks == 2
+    assert len(submitted) == 2
+    stored = manager._collection.get(where={"folder_id": "folder-1"})
+    assert sorted(stored["documents"]) == ["alpha", "beta"]
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from llama_index.core.schema import TextNode
+
+from app.core import tasks
+
+
+def _node(text, document_id, embedding):
+    return TextNode(
+        text=text,
+        metadata={"folder_id": "folder-1", "document_id": document_id, "file_name": "a.pdf"},
+        embedding=embedding,
+    )
+
+
+def test_get_document_nodes_round_trip(manager):
+    manager.add_documents(
+        [
+            _node("first chunk", "doc-123", [1.0, 0.0, 0.0]),
+            _node("second chunk", "doc-123", [0.0, 1.0, 0.0]),
+            _node("other document", "doc-456", [0.0, 0.0, 1.0]),
+        ]
+    )
+
+    nodes = manager.get_document_nodes("doc-123")
+
+    assert sorted(node.get_content() for node in nodes) == ["first chunk", "second chunk"]
+    assert all(node.metadata["document_id"] == "doc-123" for node in nodes)
+    assert sorted(node.embedding for node in nodes) == [[0.0, 1.0, 0.0], [1.0, 0.0, 0.0]]
+
+
+def test_copy_document_chunks_reuses_embeddings(manager, monkeypatch):
+    class Retriever:
+        def __init__(self):
+            self.nodes = []
+
+        def add_nodes(self, nodes):
+            self.nodes.extend(nodes)
+
+    retriever = Retriever()
+    monkeypatch.setattr(tasks, "index_manager", manager)
+    monkeypatch.setattr(tasks, "get_hybrid_retriever", lambda: retriever)
+    manager.add_documents([_node("first chunk", "doc-123", [1.0, 0.0, 0.0])])
+
+    copied = tasks.copy_document_chunks("doc-123", "folder-2", "doc-789", "b.pdf")
+
+    assert copied == 1
+    (node,) = manager.get_document_nodes("doc-789")
+    assert node.get_content() == "first chunk"
+    assert node.embedding == [1.0, 0.0, 0.0]
+    assert node.metadata["folder_id"] == "folder-2"
+    assert node.metadata["file_name"] == "b.pdf"
+    assert len(manager.get_document_nodes("doc-123")) == 1
+    assert [n.node_id for n in retriever.nodes] == [node.node_id]
+
+
+def test_aindex_nodes_deletes_written_steps_on_failure(manager, monkeypatch):
+    calls = 0
+
+    async def embed(self, texts, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            raise RuntimeError("embedding failed")
+        return [[1.0, 0.0, 0.0] for _ in texts]
+
+    monkeypatch.setattr(tasks, "index_manager", manager)
+    monkeypatch.setattr(tasks, "ASYNC_INDEX_BATCH_SIZE", 2)
+    monkeypatch.setattr(type(manager._embed_model), "aget_text_embedding_batch", embed)
+    nodes = [_node(f"chunk {i}", "doc-123", None) for i in range(4)]
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(tasks.aindex_nodes(nodes))
+
+    assert manager._collection.count() == 0